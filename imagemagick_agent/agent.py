@@ -7,7 +7,7 @@ from pathlib import Path
 
 from .config import Settings
 from .llm import LLMClient, create_llm_client
-from .llm_logger import LLMCallLogger, ExecutionLogger
+from .llm_logger import BackgroundLLMCallLogger, ExecutionLogger
 from .executor import CommandExecutor, ExecutionResult
 
 
@@ -32,7 +32,7 @@ class ImageMagickAgent:
 
         if settings.enable_logging:
             if settings.enable_llm_logging:
-                self.llm_logger = LLMCallLogger(enabled=True)
+                self.llm_logger = BackgroundLLMCallLogger(enabled=True)
             if settings.enable_execution_logging:
                 self.execution_logger = ExecutionLogger(enabled=True)
 
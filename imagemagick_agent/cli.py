@@ -146,6 +146,7 @@ def main():
                 enable_execution_logging=settings.enable_execution_logging,
                 max_bytes=settings.log_max_bytes,
                 backup_count=settings.log_backup_count,
+                compress_backups=settings.log_compress_backups,
             )
         except Exception as e:
             console.print(f"[yellow]Warning: Could not initialize logging:[/yellow] {e}")
@@ -14,6 +14,7 @@ class LLMProvider(str, Enum):
     ANTHROPIC = "anthropic"
     OPENAI = "openai"
     GOOGLE = "google"
+    RACE = "race"
 
 
 class Settings(BaseSettings):
@@ -29,12 +30,25 @@ class Settings(BaseSettings):
     # LLM Configuration
     llm_provider: LLMProvider = Field(
         default=LLMProvider.ANTHROPIC,
-        description="LLM provider to use (anthropic, openai, or google)",
+        description="LLM provider to use (anthropic, openai, google, or race)",
     )
     llm_model: str = Field(
         default="claude-3-5-sonnet-20241022",
         description="Specific model to use",
     )
+    anthropic_model: Optional[str] = Field(
+        default=None, description="Anthropic model used when racing providers"
+    )
+    openai_model: Optional[str] = Field(
+        default=None, description="OpenAI model used when racing providers"
+    )
+    google_model: Optional[str] = Field(
+        default=None, description="Google model used when racing providers"
+    )
+    max_output_tokens: int = Field(
+        default=128,
+        description="Maximum tokens the LLM may generate per command",
+    )
 
     # API Keys (loaded from environment variables)
     anthropic_api_key: Optional[str] = Field(default=None, description="Anthropic API key")
@@ -51,6 +65,20 @@ class Settings(BaseSettings):
         description="Maximum number of conversation turns to keep in history",
     )
 
+    # Semantic Cache
+    enable_semantic_cache: bool = Field(
+        default=False,
+        description="Reuse commands for paraphrased requests via embedding similarity",
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.9,
+        description="Minimum cosine similarity for a semantic cache hit",
+    )
+    semantic_cache_path: Path = Field(
+        default=Path("cache/semantic_cache.db"),
+        description="SQLite file used to persist the semantic cache",
+    )
+
     # Logging Configuration
     enable_logging: bool = Field(
         default=True,
@@ -84,6 +112,10 @@ class Settings(BaseSettings):
         default=5,
         description="Number of backup log files to keep",
     )
+    log_compress_backups: bool = Field(
+        default=False,
+        description="Gzip log files as they are rotated out",
+    )
 
     def validate_api_keys(self) -> None:
         """Validate that required API keys are set."""
@@ -93,6 +125,10 @@ class Settings(BaseSettings):
             raise ValueError("OPENAI_API_KEY must be set when using openai provider")
         if self.llm_provider == LLMProvider.GOOGLE and not self.google_api_key:
             raise ValueError("GOOGLE_API_KEY must be set when using google provider")
+        if self.llm_provider == LLMProvider.RACE:
+            keys = [self.anthropic_api_key, self.openai_api_key, self.google_api_key]
+            if sum(1 for key in keys if key) < 2:
+                raise ValueError("At least two API keys must be set when using race provider")
 
 
 def load_settings() -> Settings:
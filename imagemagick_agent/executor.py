@@ -1,6 +1,8 @@
 """ImageMagick command executor with validation and safety checks."""
 
+import functools
 import logging
+import os
 import re
 import shutil
 import subprocess
@@ -10,6 +12,49 @@ from typing import Tuple, Optional
 from dataclasses import dataclass
 
 
+def _filename(path: str) -> str:
+    """Get the last component of a path.
+
+    Uses the string-only os.path.basename rather than building a Path,
+    falling back to Path for a trailing separator (which basename maps to
+    an empty name).
+
+    Args:
+        path: Path as written in a command
+
+    Returns:
+        Final path component
+    """
+    return os.path.basename(path) or Path(path).name
+
+
+# Drops the quotes and backslashes a shell removes from a word
+_UNQUOTE = str.maketrans("", "", "'\"\\")
+
+
+@functools.lru_cache(maxsize=256)
+def _tokenize(command: str) -> Tuple[str, ...]:
+    """Split a command into whitespace-separated tokens.
+
+    Executing a command sanitizes, validates and extracts the output file
+    from the same string, so its tokens are cached rather than split by
+    each step.
+
+    Args:
+        command: Command to split
+
+    Returns:
+        Tokens of the command
+    """
+    return tuple(command.split())
+
+
+@functools.lru_cache(maxsize=256)
+def _output_path(filename: str) -> Path:
+    """Get the Path for an output filename, shared between calls (Paths are immutable)."""
+    return Path(filename)
+
+
 @dataclass
 class ExecutionResult:
     """Result of command execution."""
@@ -25,15 +70,30 @@ class ExecutionResult:
 class CommandExecutor:
     """Executes ImageMagick commands safely."""
 
-    # Allowed ImageMagick commands
-    ALLOWED_COMMANDS = {"magick", "convert", "identify", "mogrify", "composite"}
+    # Allowed ImageMagick commands. This and DANGEROUS_OPTIONS are frozen because
+    # _check_command caches its verdicts, which a changed set would leave stale
+    ALLOWED_COMMANDS = frozenset({"magick", "convert", "identify", "mogrify", "composite"})
 
     # Dangerous options that could cause issues
-    DANGEROUS_OPTIONS = {
-        "-script",  # Script execution
-        "-write",  # Writing to arbitrary locations
-        "@",  # File reference that could be exploited
-    }
+    DANGEROUS_OPTIONS = frozenset(
+        {
+            "-script",  # Script execution
+            "-write",  # Writing to arbitrary locations
+            "-delegate",  # Running external delegate programs
+            "-process",  # Loading and running image filter modules
+            "@",  # File reference that could be exploited
+        }
+    )
+
+    # Characters a shell would interpret (pipes, command separators, substitution,
+    # brace expansion, which would turn "{-write,x}" into "-write x" under bash)
+    _META_BYTES = b";|&$`{}"
+
+    # Validation error messages
+    EMPTY_COMMAND_ERROR = "Empty command"
+    COMMAND_NOT_ALLOWED_ERROR = "Command '{command}' is not allowed. Use: {allowed}"
+    DANGEROUS_OPTION_ERROR = "Dangerous option detected: {option}"
+    SHELL_METACHARACTERS_ERROR = "Shell metacharacters not allowed"
 
     def __init__(self, execution_logger=None, session_id: Optional[str] = None):
         """Initialize the executor.
@@ -76,13 +136,16 @@ class CommandExecutor:
     def validate_command(self, command: str) -> Tuple[bool, Optional[str]]:
         """Validate that a command is safe to execute.
 
+        The checks themselves are cached per command; the result is logged
+        on every call.
+
         Args:
             command: The command to validate
 
         Returns:
             Tuple of (is_valid, error_message)
         """
-        parts = command.strip().split()
+        failed_check, error_message = self._check_command(command)
 
         checks = {
             "not_empty": True,
@@ -90,40 +153,65 @@ class CommandExecutor:
             "no_dangerous_options": True,
             "no_shell_injection": True,
         }
-        error_message = None
+        if failed_check is not None:
+            checks[failed_check] = False
+
+        self._log_validation(command, failed_check is None, checks, error_message)
+        return failed_check is None, error_message
+
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def _check_command(cls, command: str) -> Tuple[Optional[str], Optional[str]]:
+        """Run the validation checks on a command.
+
+        The result only depends on the command and the class's allowed
+        commands and dangerous options, so it is cached.
+
+        Args:
+            command: The command to validate
+
+        Returns:
+            Tuple of (name of the failed check, error message), both None if
+            the command passed
+        """
+        parts = _tokenize(command)
 
         if not parts:
-            checks["not_empty"] = False
-            error_message = "Empty command"
-            self._log_validation(command, False, checks, error_message)
-            return False, error_message
+            return "not_empty", cls.EMPTY_COMMAND_ERROR
 
         # Check if it's an allowed ImageMagick command
         base_command = parts[0]
-        if base_command not in self.ALLOWED_COMMANDS:
-            checks["allowed_command"] = False
-            error_message = f"Command '{base_command}' is not allowed. Use: {', '.join(self.ALLOWED_COMMANDS)}"
-            self._log_validation(command, False, checks, error_message)
-            return False, error_message
+        if base_command not in cls.ALLOWED_COMMANDS:
+            return "allowed_command", cls.COMMAND_NOT_ALLOWED_ERROR.format(
+                command=base_command, allowed=", ".join(cls.ALLOWED_COMMANDS)
+            )
 
-        # Check for dangerous options
+        # Check for dangerous options. Options are matched as whole tokens
+        # after undoing what the shell and ImageMagick would: quotes are
+        # removed, case is ignored and "+option" is the same as "-option".
+        # Other entries (such as "@") are rejected anywhere in a token.
+        options = {o for o in cls.DANGEROUS_OPTIONS if o.startswith("-")}
+        fragments = cls.DANGEROUS_OPTIONS - options
         for part in parts:
-            for dangerous in self.DANGEROUS_OPTIONS:
-                if dangerous in part:
-                    checks["no_dangerous_options"] = False
-                    error_message = f"Dangerous option detected: {dangerous}"
-                    self._log_validation(command, False, checks, error_message)
-                    return False, error_message
+            name = part.translate(_UNQUOTE).lower()
+            if name.startswith("+"):
+                name = "-" + name[1:]
+            if name in options:
+                return "no_dangerous_options", cls.DANGEROUS_OPTION_ERROR.format(option=name)
+            for fragment in fragments:
+                if fragment in part:
+                    return "no_dangerous_options", cls.DANGEROUS_OPTION_ERROR.format(
+                        option=fragment
+                    )
 
         # Check for shell injection attempts
-        if any(char in command for char in [";", "|", "&", "$", "`"]):
-            checks["no_shell_injection"] = False
-            error_message = "Shell metacharacters not allowed"
-            self._log_validation(command, False, checks, error_message)
-            return False, error_message
+        # Deleting the metacharacters is a single C-level pass over the bytes; they
+        # are ASCII, so they never occur inside a multi-byte UTF-8 sequence
+        raw = command.encode("utf-8", "surrogatepass")
+        if len(raw.translate(None, cls._META_BYTES)) != len(raw):
+            return "no_shell_injection", cls.SHELL_METACHARACTERS_ERROR
 
-        self._log_validation(command, True, checks, None)
-        return True, None
+        return None, None
 
     def _log_validation(
         self, command: str, passed: bool, checks: dict, error_message: Optional[str]
@@ -155,7 +243,7 @@ class CommandExecutor:
         Returns:
             Sanitized command with only filenames (no directory paths)
         """
-        parts = command.split()
+        parts = list(_tokenize(command))
 
         # Find the output file (last non-option argument)
         for i in range(len(parts) - 1, 0, -1):
@@ -163,7 +251,7 @@ class CommandExecutor:
             if not part.startswith("-") and part != parts[0] and "." in part:
                 # This is likely the output file
                 original_path = part
-                sanitized_path = Path(part).name  # Extract just the filename
+                sanitized_path = _filename(part)  # Extract just the filename
 
                 if original_path != sanitized_path:
                     # Replace the path in the command
@@ -184,7 +272,7 @@ class CommandExecutor:
         Returns:
             Path to output file if found, None otherwise
         """
-        parts = command.split()
+        parts = _tokenize(command)
 
         # For most ImageMagick commands, the last argument is the output file
         # unless it's an option starting with -
@@ -194,8 +282,7 @@ class CommandExecutor:
                 if "." in part:  # Has an extension
                     # Extract just the filename, strip any directory paths
                     # This prevents issues with non-existent directories
-                    output_path = Path(part)
-                    return Path(output_path.name)
+                    return _output_path(_filename(part))
 
         return None
 
@@ -324,7 +411,7 @@ class CommandExecutor:
         Returns:
             True if file exists, False otherwise
         """
-        return Path(file_path).exists()
+        return os.path.exists(file_path)
 
     def get_image_info(self, file_path: str) -> Optional[str]:
         """Get information about an image file.
@@ -637,6 +637,7 @@ def launch(share: bool = False, server_port: int = 7860):
                 enable_execution_logging=settings.enable_execution_logging,
                 max_bytes=settings.log_max_bytes,
                 backup_count=settings.log_backup_count,
+                compress_backups=settings.log_compress_backups,
             )
             print(f"✓ Logging enabled - logs directory: {settings.log_dir.absolute()}")
         except Exception as e:
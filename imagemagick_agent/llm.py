@@ -1,21 +1,157 @@
 """LLM integration for generating ImageMagick commands."""
 
+import asyncio
+import atexit
+import functools
+import hashlib
+import json
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
 
-from anthropic import Anthropic
-from openai import OpenAI
-import google.generativeai as genai
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
 from .config import Settings, LLMProvider
+from .executor import CommandExecutor
 from .llm_logger import LLMCallLogger
+from .semantic_cache import SemanticCache
 
+# Provider SDKs (and httpx) are imported where they are first used, so a process
+# only pays the import time and memory of the provider it is configured for
+if TYPE_CHECKING:
+    import httpx
 
+_LOG = logging.getLogger("imagemagick_agent.llm")
+
+# ImageMagick commands are short (typically <60 tokens); a tight cap keeps
+# providers from reserving and scheduling for far longer generations
+MAX_OUTPUT_TOKENS = 128
+
+# Maximum number of Gemini chat sessions kept per client
+MAX_CHAT_SESSIONS = 32
+
+# Model used for each provider when racing providers and no model is configured for it
+DEFAULT_MODELS = {
+    LLMProvider.ANTHROPIC: "claude-3-5-sonnet-20241022",
+    LLMProvider.OPENAI: "gpt-4-turbo",
+    LLMProvider.GOOGLE: "gemini-1.5-flash",
+}
+
+# Attempts per request (including the first) for transient provider errors
+RETRY_ATTEMPTS = 4
+
+# Process-wide HTTP connection pool shared by the Anthropic and OpenAI SDK clients
+_HTTP_CLIENT: Optional["httpx.Client"] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def _get_http_client() -> "httpx.Client":
+    """Return the HTTP client shared by all SDK client instances.
+
+    Reusing one pool keeps connections alive across clients and lets HTTP/2
+    multiplex concurrent requests, so new clients skip the TCP+TLS handshake.
+
+    Returns:
+        Shared httpx client (created on first use, closed at exit)
+    """
+    global _HTTP_CLIENT
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is None:
+            import httpx
+
+            _HTTP_CLIENT = httpx.Client(
+                http2=True,
+                timeout=60.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            )
+            atexit.register(_HTTP_CLIENT.close)
+        return _HTTP_CLIENT
+
+
+def _retry_transient(errors: Tuple[Type[BaseException], ...]) -> Callable:
+    """Build a decorator that retries a call on transient provider errors.
+
+    Rate limits, overloaded servers and dropped connections usually clear up
+    within seconds, so the call is retried with jittered exponential backoff
+    instead of failing the whole agent step. Other errors (bad request,
+    authentication) are raised immediately.
+
+    Args:
+        errors: Exception types that are safe to retry
+
+    Returns:
+        Retry decorator that re-raises the last error once attempts run out
+    """
+    return retry(
+        reraise=True,
+        stop=stop_after_attempt(RETRY_ATTEMPTS),
+        wait=wait_random_exponential(multiplier=1, max=30),
+        retry=retry_if_exception_type(errors),
+    )
+
+
+def _join_continued(lines: List[str]) -> str:
+    """Join a command's backslash-continued lines into one line.
+
+    The executor re-joins tokens with spaces, where a leftover backslash
+    would escape one.
+    """
+    return " ".join(line.strip().rstrip("\\").strip() for line in lines)
+
+
+def _read_command(chunks: Iterable[str]) -> Tuple[str, bool]:
+    """Collect streamed text, stopping as soon as a complete command line arrives.
+
+    Generation is only cut short when the first line starts with an ImageMagick
+    command, so multi-line replies such as clarification questions are still
+    read in full. A command continued onto the next line with a trailing
+    backslash is read up to its last line and joined into one line.
+
+    Args:
+        chunks: Text fragments in the order they are streamed
+
+    Returns:
+        Tuple of (the command, or the full stripped reply if it is not a
+        command; whether reading stopped before the stream ended)
+    """
+    text = ""
+    # Whether the reply is a command; None until its first line is complete
+    is_command: Optional[bool] = None
+    for chunk in chunks:
+        text += chunk
+        if is_command is False:
+            continue
+        lines = text.lstrip().split("\n")
+        if len(lines) < 2:
+            continue
+        if is_command is None:
+            is_command = lines[0].strip().split(" ", 1)[0] in CommandExecutor.ALLOWED_COMMANDS
+            if not is_command:
+                continue
+        # The last element is a line still being streamed
+        for i, line in enumerate(lines[:-1]):
+            if not line.rstrip().endswith("\\"):
+                return _join_continued(lines[: i + 1]), True
+    if is_command:
+        # The stream ended partway through a continued command
+        return _join_continued(text.strip().split("\n")), False
+    return text.strip(), False
+
+
+@functools.lru_cache(maxsize=4)
 def get_system_prompt(imagemagick_command: str = "magick") -> str:
     """Generate system prompt with the correct ImageMagick command.
 
+    The result is cached, so every client built for the same command shares
+    the identical prompt object. Provider prompt caches match on an exact
+    prefix, so callers must pass it through unchanged rather than building
+    variations of it.
+
     Args:
         imagemagick_command: The base command to use ('magick' or 'convert')
 
@@ -62,6 +198,80 @@ class LLMClient(ABC):
         """
         pass
 
+    async def agenerate_command(
+        self, user_message: str, history: List[Dict[str, str]], session_id: Optional[str] = None
+    ) -> str:
+        """Generate an ImageMagick command without blocking the event loop.
+
+        The default implementation runs generate_command in a worker thread.
+
+        Args:
+            user_message: The user's request
+            history: List of previous messages in the conversation
+            session_id: Optional session ID for tracking
+
+        Returns:
+            Generated ImageMagick command as a string
+        """
+        return await asyncio.to_thread(self.generate_command, user_message, history, session_id)
+
+    async def agenerate_commands(
+        self,
+        prompts: List[str],
+        concurrency: int = 8,
+        checkpoint_path: Optional[Path] = None,
+    ) -> List[str]:
+        """Generate commands for many standalone requests concurrently.
+
+        At most ``concurrency`` requests are in flight at once. With a
+        checkpoint file, every finished command is appended to it as a JSON
+        line, and prompts already recorded there are not sent again, so a
+        batch that fails part way resumes where it stopped.
+
+        Args:
+            prompts: User requests, each handled without conversation history
+            concurrency: Maximum number of simultaneous LLM calls
+            checkpoint_path: Optional JSONL file recording finished commands
+
+        Returns:
+            Generated commands in the same order as ``prompts``
+        """
+        done: Dict[str, str] = {}
+        if checkpoint_path is not None:
+            checkpoint_path = Path(checkpoint_path)
+            if checkpoint_path.exists():
+                with open(checkpoint_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            done[entry["key"]] = entry["command"]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(prompt: str) -> str:
+            key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+            if key in done:
+                return done[key]
+            async with semaphore:
+                command = await self.agenerate_command(prompt, [])
+            done[key] = command
+            if checkpoint_path is not None:
+                # Completions run on the event loop thread, so appends never interleave
+                with open(checkpoint_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"key": key, "command": command}, ensure_ascii=False) + "\n")
+            return command
+
+        return await asyncio.gather(*(run(prompt) for prompt in prompts))
+
+    def generate_commands(
+        self,
+        prompts: List[str],
+        concurrency: int = 8,
+        checkpoint_path: Optional[Path] = None,
+    ) -> List[str]:
+        """Synchronous wrapper around agenerate_commands."""
+        return asyncio.run(self.agenerate_commands(prompts, concurrency, checkpoint_path))
+
 
 class AnthropicClient(LLMClient):
     """Anthropic Claude LLM client."""
@@ -72,16 +282,28 @@ class AnthropicClient(LLMClient):
         model: str,
         system_prompt: str,
         llm_logger: Optional[LLMCallLogger] = None,
+        max_tokens: int = MAX_OUTPUT_TOKENS,
     ):
-        self.client = Anthropic(api_key=api_key)
+        import anthropic
+
+        # Retries are handled by _retry so SDK and tenacity backoff don't compound
+        self.client = anthropic.Anthropic(api_key=api_key, http_client=_get_http_client(), max_retries=0)
+        self._retry = _retry_transient(
+            (anthropic.RateLimitError, anthropic.APIConnectionError, anthropic.InternalServerError)
+        )
         self.model = model
         self.system_prompt = system_prompt
+        self.max_tokens = max_tokens
+        # Mark the static system prompt as a cacheable prefix so repeat calls
+        # within the cache TTL read it at a discount instead of re-processing it
+        self._system_blocks = [
+            {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+        ]
         self.llm_logger = llm_logger
-        self.logger = logging.getLogger("imagemagick_agent.llm")
 
     def generate_command(self, user_message: str, history: List[Dict[str, str]], session_id: Optional[str] = None) -> str:
         """Generate command using Claude."""
-        messages = history + [{"role": "user", "content": user_message}]
+        messages = [*history, {"role": "user", "content": user_message}]
 
         # Log request
         request_id = None
@@ -95,44 +317,60 @@ class AnthropicClient(LLMClient):
                 session_id=session_id,
             )
 
-        start_time = time.time()
-        error = None
+        start_time = time.perf_counter()
 
-        try:
-            response = self.client.messages.create(
+        @self._retry
+        def _call():
+            # Stream so we can stop reading once the command line is complete
+            with self.client.messages.stream(
                 model=self.model,
-                max_tokens=1024,
-                system=self.system_prompt,
+                max_tokens=self.max_tokens,
+                system=self._system_blocks,
                 messages=messages,
-            )
+            ) as stream:
+                command, stopped_early = _read_command(stream.text_stream)
+                return command, stopped_early, stream.current_message_snapshot.usage
 
-            command = response.content[0].text.strip()
-            response_time_ms = (time.time() - start_time) * 1000
+        try:
+            command, stopped_early, usage = _call()
+
+            response_time_ms = (time.perf_counter() - start_time) * 1000
 
             # Log successful response
             if self.llm_logger:
+                token_usage = {
+                    "input_tokens": usage.input_tokens,
+                    "cache_creation_input_tokens": (
+                        getattr(usage, "cache_creation_input_tokens", None) or 0
+                    ),
+                    "cache_read_input_tokens": (
+                        getattr(usage, "cache_read_input_tokens", None) or 0
+                    ),
+                }
+                # The input counts are final once message_start arrives, but a stream
+                # closed early only has a partial output count, which is left out
+                if not stopped_early:
+                    token_usage["output_tokens"] = usage.output_tokens
+
                 self.llm_logger.log_response(
                     request_id=request_id,
                     generated_command=command,
                     response_time_ms=response_time_ms,
-                    token_usage={
-                        "input_tokens": response.usage.input_tokens,
-                        "output_tokens": response.usage.output_tokens,
-                    },
+                    token_usage=token_usage,
                     session_id=session_id,
                 )
 
-            self.logger.debug(
-                f"Generated command via Anthropic in {response_time_ms:.2f}ms: {command[:100]}"
+            _LOG.debug(
+                "Generated command via Anthropic in %.2fms: %s", response_time_ms, command[:100]
             )
 
             return command
 
         except Exception as e:
             error_msg = str(e)
-            response_time_ms = (time.time() - start_time) * 1000
+            response_time_ms = (time.perf_counter() - start_time) * 1000
 
-            self.logger.error(f"Anthropic LLM generation failed: {error_msg}")
+            _LOG.exception("Anthropic LLM generation failed")
 
             # Log error response
             if self.llm_logger:
@@ -156,17 +394,24 @@ class OpenAIClient(LLMClient):
         model: str,
         system_prompt: str,
         llm_logger: Optional[LLMCallLogger] = None,
+        max_tokens: int = MAX_OUTPUT_TOKENS,
     ):
-        self.client = OpenAI(api_key=api_key)
+        import openai
+
+        # Retries are handled by _retry so SDK and tenacity backoff don't compound
+        self.client = openai.OpenAI(api_key=api_key, http_client=_get_http_client(), max_retries=0)
+        self._retry = _retry_transient(
+            (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+        )
         self.model = model
         self.system_prompt = system_prompt
+        self._system_message = {"role": "system", "content": system_prompt}
+        self.max_tokens = max_tokens
         self.llm_logger = llm_logger
-        self.logger = logging.getLogger("imagemagick_agent.llm")
 
     def generate_command(self, user_message: str, history: List[Dict[str, str]], session_id: Optional[str] = None) -> str:
         """Generate command using OpenAI."""
-        messages = [{"role": "system", "content": self.system_prompt}] + history
-        messages.append({"role": "user", "content": user_message})
+        messages = [self._system_message, *history, {"role": "user", "content": user_message}]
 
         # Log request
         request_id = None
@@ -180,26 +425,54 @@ class OpenAIClient(LLMClient):
                 session_id=session_id,
             )
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
-        try:
-            response = self.client.chat.completions.create(
+        @self._retry
+        def _call():
+            # Stream so we can stop reading once the command line is complete
+            stream = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                max_tokens=1024,
+                max_tokens=self.max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
             )
+            usage = None
+
+            def texts():
+                nonlocal usage
+                for chunk in stream:
+                    # Usage arrives in a final chunk without choices
+                    if chunk.usage:
+                        usage = chunk.usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+
+            try:
+                command, _ = _read_command(texts())
+                return command, usage
+            finally:
+                stream.close()
 
-            command = response.choices[0].message.content.strip()
-            response_time_ms = (time.time() - start_time) * 1000
+        try:
+            command, usage = _call()
 
-            # Log successful response
+            response_time_ms = (time.perf_counter() - start_time) * 1000
+
+            # Log successful response. OpenAI only reports usage in the final
+            # chunk, so a stream closed early after the command has none
             if self.llm_logger:
                 token_usage = {}
-                if hasattr(response, "usage") and response.usage:
+                if usage:
                     token_usage = {
-                        "input_tokens": response.usage.prompt_tokens,
-                        "output_tokens": response.usage.completion_tokens,
+                        "input_tokens": usage.prompt_tokens,
+                        "output_tokens": usage.completion_tokens,
                     }
+                    # OpenAI caches long prompt prefixes automatically; the system
+                    # prompt is always the first message so it forms a stable prefix
+                    details = getattr(usage, "prompt_tokens_details", None)
+                    if details is not None and getattr(details, "cached_tokens", None):
+                        token_usage["cache_read_input_tokens"] = details.cached_tokens
 
                 self.llm_logger.log_response(
                     request_id=request_id,
@@ -209,17 +482,17 @@ class OpenAIClient(LLMClient):
                     session_id=session_id,
                 )
 
-            self.logger.debug(
-                f"Generated command via OpenAI in {response_time_ms:.2f}ms: {command[:100]}"
+            _LOG.debug(
+                "Generated command via OpenAI in %.2fms: %s", response_time_ms, command[:100]
             )
 
             return command
 
         except Exception as e:
             error_msg = str(e)
-            response_time_ms = (time.time() - start_time) * 1000
+            response_time_ms = (time.perf_counter() - start_time) * 1000
 
-            self.logger.error(f"OpenAI LLM generation failed: {error_msg}")
+            _LOG.exception("OpenAI LLM generation failed")
 
             # Log error response
             if self.llm_logger:
@@ -243,25 +516,72 @@ class GoogleClient(LLMClient):
         model: str,
         system_prompt: str,
         llm_logger: Optional[LLMCallLogger] = None,
+        max_tokens: int = MAX_OUTPUT_TOKENS,
+        keep_chats: bool = True,
     ):
+        import google.generativeai as genai
+        from google.api_core import exceptions as google_exceptions
+
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(
             model_name=model,
             system_instruction=system_prompt,
+            generation_config={"max_output_tokens": max_tokens},
         )
         self.system_prompt = system_prompt
-        self.chat = None
+        self._retry = _retry_transient(
+            (
+                google_exceptions.ResourceExhausted,
+                google_exceptions.ServiceUnavailable,
+                google_exceptions.InternalServerError,
+            )
+        )
+        # Without kept chats every request starts a throwaway chat from the
+        # history, for callers that may discard the answer (e.g. racing)
+        self.keep_chats = keep_chats
+        # SDK chat sessions keyed by session ID, least recently used first
+        self._chats: "OrderedDict[Optional[str], Any]" = OrderedDict()
+        self._chats_lock = threading.Lock()
         self.llm_logger = llm_logger
-        self.logger = logging.getLogger("imagemagick_agent.llm")
+
+    def _start_chat(self, history: List[Dict[str, str]]) -> Any:
+        """Start an SDK chat from the conversation history."""
+        gemini_history = [
+            {"role": "user" if msg["role"] == "user" else "model", "parts": [msg["content"]]}
+            for msg in history
+        ]
+        return self.model.start_chat(history=gemini_history)
+
+    def _get_chat(self, history: List[Dict[str, str]], session_id: Optional[str]) -> Any:
+        """Get the SDK chat for a session, starting a new one if needed.
+
+        The chat object keeps the conversation itself, so an existing session
+        only sends the new message. History is converted to Gemini format only
+        when a chat has to be (re)created; an empty history means the
+        conversation was reset.
+
+        Args:
+            history: List of previous messages in the conversation
+            session_id: Session the request belongs to
+
+        Returns:
+            Gemini chat session
+        """
+        if not self.keep_chats:
+            return self._start_chat(history)
+
+        with self._chats_lock:
+            chat = self._chats.pop(session_id, None)
+            if chat is None or not history:
+                chat = self._start_chat(history)
+
+            self._chats[session_id] = chat
+            if len(self._chats) > MAX_CHAT_SESSIONS:
+                self._chats.popitem(last=False)
+            return chat
 
     def generate_command(self, user_message: str, history: List[Dict[str, str]], session_id: Optional[str] = None) -> str:
         """Generate command using Google Gemini."""
-        # Convert history to Gemini format
-        gemini_history = []
-        for msg in history:
-            role = "user" if msg["role"] == "user" else "model"
-            gemini_history.append({"role": role, "parts": [msg["content"]]})
-
         # Log request
         request_id = None
         if self.llm_logger:
@@ -274,17 +594,16 @@ class GoogleClient(LLMClient):
                 session_id=session_id,
             )
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
-            # Create or update chat session
-            if self.chat is None or len(history) == 0:
-                self.chat = self.model.start_chat(history=gemini_history)
+            chat = self._get_chat(history, session_id)
 
-            # Send message and get response
-            response = self.chat.send_message(user_message)
+            # Send message and get response; a failed send leaves the chat
+            # history untouched, so it is safe to retry
+            response = self._retry(chat.send_message)(user_message)
             command = response.text.strip()
-            response_time_ms = (time.time() - start_time) * 1000
+            response_time_ms = (time.perf_counter() - start_time) * 1000
 
             # Log successful response
             if self.llm_logger:
@@ -303,17 +622,17 @@ class GoogleClient(LLMClient):
                     session_id=session_id,
                 )
 
-            self.logger.debug(
-                f"Generated command via Google in {response_time_ms:.2f}ms: {command[:100]}"
+            _LOG.debug(
+                "Generated command via Google in %.2fms: %s", response_time_ms, command[:100]
             )
 
             return command
 
         except Exception as e:
             error_msg = str(e)
-            response_time_ms = (time.time() - start_time) * 1000
+            response_time_ms = (time.perf_counter() - start_time) * 1000
 
-            self.logger.error(f"Google LLM generation failed: {error_msg}")
+            _LOG.exception("Google LLM generation failed")
 
             # Log error response
             if self.llm_logger:
@@ -328,6 +647,135 @@ class GoogleClient(LLMClient):
             raise
 
 
+class RacingLLMClient(LLMClient):
+    """Client that sends each request to several providers and keeps the fastest answer.
+
+    LLM API latency has a heavy tail, so the minimum over several providers is
+    usually well below any single provider's latency, at the cost of paying for
+    the extra requests. Calls still in flight when a winner is found are
+    abandoned; their results are discarded.
+    """
+
+    def __init__(self, clients: List[LLMClient]):
+        if not clients:
+            raise ValueError("RacingLLMClient requires at least one client")
+        self.clients = clients
+
+    def generate_command(self, user_message: str, history: List[Dict[str, str]], session_id: Optional[str] = None) -> str:
+        """Generate command using whichever provider answers first."""
+        executor = ThreadPoolExecutor(max_workers=len(self.clients))
+        futures = [
+            executor.submit(client.generate_command, user_message, history, session_id)
+            for client in self.clients
+        ]
+        error = None
+        try:
+            for future in as_completed(futures):
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+                _LOG.warning("Racing provider failed: %s", error)
+        finally:
+            # Don't wait for the losing calls to finish
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        raise error
+
+    async def agenerate_command(
+        self, user_message: str, history: List[Dict[str, str]], session_id: Optional[str] = None
+    ) -> str:
+        """Generate command using whichever provider answers first."""
+        tasks = [
+            asyncio.ensure_future(client.agenerate_command(user_message, history, session_id))
+            for client in self.clients
+        ]
+        pending = set(tasks)
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                    _LOG.warning("Racing provider failed: %s", error)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise error
+
+
+class SemanticCacheClient(LLMClient):
+    """LLM client wrapper that serves paraphrased requests from a semantic cache."""
+
+    def __init__(self, client: LLMClient, cache: SemanticCache):
+        self.client = client
+        self.cache = cache
+
+    def generate_command(self, user_message: str, history: List[Dict[str, str]], session_id: Optional[str] = None) -> str:
+        """Generate command, reusing a cached one for similar standalone requests."""
+        # Follow-ups like "now rotate it" depend on earlier turns, so only
+        # requests without conversation history are served from the cache
+        if history:
+            return self.client.generate_command(user_message, history, session_id=session_id)
+
+        command = self.cache.get(user_message)
+        if command is not None:
+            _LOG.debug("Served command from semantic cache: %s", command[:100])
+            return command
+
+        command = self.client.generate_command(user_message, history, session_id=session_id)
+        self.cache.put(user_message, command)
+        return command
+
+
+def _create_racing_client(
+    settings: Settings, system_prompt: str, llm_logger: Optional[LLMCallLogger]
+) -> LLMClient:
+    """Create a client racing every provider that has an API key configured.
+
+    Each provider uses its ``<provider>_model`` setting, falling back to
+    ``DEFAULT_MODELS``; ``llm_model`` names a single provider's model and is ignored.
+    """
+    clients: List[LLMClient] = []
+    for provider, default_model in DEFAULT_MODELS.items():
+        api_key = getattr(settings, f"{provider.value}_api_key")
+        if api_key:
+            model = getattr(settings, f"{provider.value}_model") or default_model
+            if provider == LLMProvider.GOOGLE:
+                # A losing answer is discarded, so it must not stay in a kept Gemini chat
+                clients.append(
+                    GoogleClient(
+                        api_key,
+                        model,
+                        system_prompt,
+                        llm_logger,
+                        max_tokens=settings.max_output_tokens,
+                        keep_chats=False,
+                    )
+                )
+                continue
+            provider_settings = settings.model_copy(update={"llm_model": model})
+            clients.append(_FACTORY[provider](provider_settings, system_prompt, llm_logger))
+    return RacingLLMClient(clients)
+
+
+# Client constructors keyed by provider, called as factory(settings, system_prompt, llm_logger)
+_FACTORY: Dict[LLMProvider, Callable[[Settings, str, Optional[LLMCallLogger]], LLMClient]] = {
+    LLMProvider.ANTHROPIC: lambda s, sp, l: AnthropicClient(
+        s.anthropic_api_key, s.llm_model, sp, l, max_tokens=s.max_output_tokens
+    ),
+    LLMProvider.OPENAI: lambda s, sp, l: OpenAIClient(
+        s.openai_api_key, s.llm_model, sp, l, max_tokens=s.max_output_tokens
+    ),
+    LLMProvider.GOOGLE: lambda s, sp, l: GoogleClient(
+        s.google_api_key, s.llm_model, sp, l, max_tokens=s.max_output_tokens
+    ),
+    LLMProvider.RACE: _create_racing_client,
+}
+
+
 def create_llm_client(
     settings: Settings,
     imagemagick_command: str = "magick",
@@ -346,28 +794,19 @@ def create_llm_client(
     Raises:
         ValueError: If provider is not supported
     """
-    system_prompt = get_system_prompt(imagemagick_command)
-
-    if settings.llm_provider == LLMProvider.ANTHROPIC:
-        return AnthropicClient(
-            api_key=settings.anthropic_api_key,
-            model=settings.llm_model,
-            system_prompt=system_prompt,
-            llm_logger=llm_logger,
+    try:
+        factory = _FACTORY[settings.llm_provider]
+    except KeyError:
+        raise ValueError(f"Unsupported LLM provider: {settings.llm_provider}") from None
+
+    client = factory(settings, get_system_prompt(imagemagick_command), llm_logger)
+
+    if settings.enable_semantic_cache:
+        cache = SemanticCache(
+            path=settings.semantic_cache_path,
+            threshold=settings.semantic_cache_threshold,
+            scope=f"{settings.llm_provider.value}/{imagemagick_command}",
         )
-    elif settings.llm_provider == LLMProvider.OPENAI:
-        return OpenAIClient(
-            api_key=settings.openai_api_key,
-            model=settings.llm_model,
-            system_prompt=system_prompt,
-            llm_logger=llm_logger,
-        )
-    elif settings.llm_provider == LLMProvider.GOOGLE:
-        return GoogleClient(
-            api_key=settings.google_api_key,
-            model=settings.llm_model,
-            system_prompt=system_prompt,
-            llm_logger=llm_logger,
-        )
-    else:
-        raise ValueError(f"Unsupported LLM provider: {settings.llm_provider}")
+        client = SemanticCacheClient(client, cache)
+
+    return client
@@ -7,13 +7,17 @@ This module provides structured logging for LLM interactions including:
 - Request/response correlation via request IDs
 """
 
-import json
+import atexit
 import logging
+import queue
+import threading
 import time
 import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from .logging_config import log_json
+
 
 class LLMCallLogger:
     """
@@ -161,14 +165,88 @@ class LLMCallLogger:
             data: Dictionary to write as JSON
         """
         try:
-            json_line = json.dumps(data, ensure_ascii=False)
-            self.logger.debug(json_line)
+            log_json(self.logger, data)
         except Exception as e:
             # Fallback logging if JSON serialization fails
             app_logger = logging.getLogger("imagemagick_agent")
             app_logger.error(f"Failed to write LLM log: {e}")
 
 
+class BackgroundLLMCallLogger(LLMCallLogger):
+    """
+    LLM call logger that serializes and writes entries on a background thread.
+
+    Logging calls only enqueue the entry, so LLM requests return to the caller
+    as soon as the provider responds rather than after JSON encoding and file
+    I/O. Call flush() to wait for queued entries to be written.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize background LLM call logger.
+
+        Args:
+            enabled: Whether logging is enabled
+        """
+        super().__init__(enabled=enabled)
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._drain, name="llm-call-logger", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def log_request(
+        self,
+        provider: str,
+        model: str,
+        user_input: str,
+        conversation_history: List[Dict[str, str]],
+        system_prompt: str,
+        request_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> str:
+        """
+        Log an LLM API request.
+
+        The history is copied because the caller keeps appending to its list
+        before the entry is serialized.
+        """
+        return super().log_request(
+            provider=provider,
+            model=model,
+            user_input=user_input,
+            conversation_history=list(conversation_history),
+            system_prompt=system_prompt,
+            request_id=request_id,
+            metadata=metadata,
+            session_id=session_id,
+        )
+
+    def flush(self) -> None:
+        """Block until every queued entry has been written."""
+        self._queue.join()
+
+    def _write_json(self, data: Dict[str, Any]) -> None:
+        """
+        Queue a JSON object to be written by the background thread.
+
+        Args:
+            data: Dictionary to write as JSON
+        """
+        self._queue.put(data)
+
+    def _drain(self) -> None:
+        """Write queued entries until the process exits."""
+        while True:
+            data = self._queue.get()
+            try:
+                super()._write_json(data)
+            finally:
+                self._queue.task_done()
+
+
 class ExecutionLogger:
     """
     Logger for ImageMagick command execution audit trail.
@@ -329,8 +407,7 @@ class ExecutionLogger:
             data: Dictionary to write as JSON
         """
         try:
-            json_line = json.dumps(data, ensure_ascii=False)
-            self.logger.debug(json_line)
+            log_json(self.logger, data)
         except Exception as e:
             app_logger = logging.getLogger("imagemagick_agent")
             app_logger.error(f"Failed to write execution log: {e}")
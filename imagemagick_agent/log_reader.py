@@ -5,10 +5,648 @@ This module provides reusable functions for reading and analyzing logs
 that can be used by both the Gradio interface and Flask web viewer.
 """
 
+import bisect
+import copy
+import functools
+import hashlib
+import heapq
+import itertools
 import json
+import mmap
+import os
+import re
+import sys
+import threading
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+# Log files are read in binary mode and each raw line is handed to _loads.
+# orjson parses bytes directly (trailing newline included) in C; the stdlib
+# parser accepts bytes too. Either way a bad line raises a ValueError subclass.
+_loads: Callable[[bytes], Any]
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Block size for reading log files backwards
+_BLOCK_SIZE = 65536
+
+# Larger unparsed ranges are memory-mapped instead of read into memory at once
+_BULK_READ_LIMIT = 32 * 1024 * 1024
+
+# Divider row between sessions in the unified table
+_SEP_ROW = ("════════",) * 6
+
+# Fields holding a small, fixed vocabulary of values
+_INTERNED_FIELDS = ("event", "provider", "feedback", "validation_result")
+
+
+def _intern_fields(entry: Any) -> Any:
+    """
+    Intern the enum-like string fields of a parsed log entry.
+
+    Every entry then shares one string object per value, which saves memory
+    in the parsed-entry cache and lets comparisons such as
+    ``event == "llm_response"`` succeed on the identity check.
+
+    Args:
+        entry: Parsed log line
+
+    Returns:
+        The same entry, modified in place
+    """
+    if isinstance(entry, dict):
+        for key in _INTERNED_FIELDS:
+            value = entry.get(key)
+            if type(value) is str:
+                entry[key] = sys.intern(value)
+    return entry
+
+
+def _iter_lines_reverse(path: Path) -> Iterator[bytes]:
+    """
+    Yield the lines of a file from last to first.
+
+    The file is read backwards in fixed-size blocks, so reading the last few
+    lines costs the same regardless of file size.
+
+    Args:
+        path: File to read
+
+    Yields:
+        Non-empty lines without their trailing newline
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+
+    with f:
+        pos = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while pos > 0:
+            size = min(_BLOCK_SIZE, pos)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + remainder).split(b"\n")
+            # The first piece may continue in the previous block
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line
+        if remainder:
+            yield remainder
+
+
+def _iter_jsonl_bytes(path: Path, start: int = 0) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yield the complete lines of a file from a byte offset.
+
+    Up to _BULK_READ_LIMIT bytes are read in one go and split in C; larger
+    ranges are memory-mapped and split with ``mmap.find`` to bound memory
+    use. Either way lines come out as raw bytes ready for the JSON parser
+    without going through buffered readline. A trailing line without a
+    newline is not yielded.
+
+    Args:
+        path: File to read
+        start: Byte offset to start from (must be at a line boundary)
+
+    Yields:
+        Tuples of (line without newline, offset just past the line)
+    """
+    with open(path, "rb") as f:
+        fd = f.fileno()
+        size = os.fstat(fd).st_size
+        # Empty files can't be mapped
+        if size <= start:
+            return
+        pos = start
+        if size - start <= _BULK_READ_LIMIT:
+            f.seek(start)
+            lines = f.read(size - start).split(b"\n")
+            # The last piece is unfinished (or empty, after a final newline)
+            del lines[-1]
+            for line in lines:
+                pos += len(line) + 1
+                yield line, pos
+        else:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                # The scan is strictly linear: ask the kernel for aggressive readahead
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                find = mm.find
+                while True:
+                    nl = find(b"\n", pos)
+                    if nl == -1:
+                        break
+                    yield mm[pos:nl], nl + 1
+                    pos = nl + 1
+
+        # Parsed lines are never read again; let the kernel drop their pages
+        # rather than keep them cached on every stats refresh
+        if hasattr(os, "posix_fadvise") and pos > start:
+            os.posix_fadvise(fd, start, pos - start, os.POSIX_FADV_DONTNEED)
+
+
+def _field_needles(key: str, value: Union[str, bool]) -> Tuple[bytes, ...]:
+    """
+    Build the byte patterns a raw log line contains when ``key`` equals ``value``.
+
+    Log writers serialize with ``ensure_ascii=False``, so a matching entry
+    contains the JSON-encoded key and value verbatim, joined by ``": "``
+    (stdlib json) or ``":"`` (compact writers). A line holding neither
+    pattern can't match and needn't be parsed; a line holding one may still
+    not match (e.g. the value appears under another key), so parsed entries
+    are always re-checked.
+
+    Args:
+        key: Top-level field name
+        value: Required string or boolean value
+
+    Returns:
+        Alternative patterns, any of which may appear in a matching line
+    """
+    k = json.dumps(key).encode("utf-8")
+    v = json.dumps(value, ensure_ascii=False).encode("utf-8")
+    return (k + b": " + v, k + b":" + v)
+
+
+def _count_field(data: bytes, key: str, value: Union[str, bool]) -> int:
+    """
+    Count the lines of raw JSONL data in which ``key`` equals ``value``.
+
+    Quotes inside JSON strings are escaped, so the patterns can't match
+    within a string value, but they do match the same key/value pair in a
+    nested object. The log writers never nest the fields counted here.
+
+    Args:
+        data: Raw log file contents
+        key: Field name
+        value: Field value
+
+    Returns:
+        Number of occurrences, in either separator style
+    """
+    return sum(data.count(needle) for needle in _field_needles(key, value))
+
+
+def _trunc(text: str, width: int = 50) -> str:
+    """Shorten text for a table cell, marking it with "..." only if it was cut."""
+    return text if len(text) <= width else text[:width] + "..."
+
+
+def _search_pattern(query: str) -> Pattern[bytes]:
+    """
+    Compile a case-insensitive pattern matching text in raw log lines.
+
+    Log lines are UTF-8, so the pattern works on bytes. ``re.IGNORECASE``
+    only folds ASCII letters in bytes patterns, so any other cased
+    character is matched through an alternation of its case variants.
+
+    Args:
+        query: Text to look for
+
+    Returns:
+        Compiled bytes pattern
+    """
+    parts = []
+    for char in query:
+        variants = sorted({char, char.lower(), char.upper()})
+        if char.isascii() or len(variants) == 1:
+            parts.append(re.escape(char.encode("utf-8")))
+        else:
+            alternatives = b"|".join(re.escape(v.encode("utf-8")) for v in variants)
+            parts.append(b"(?:" + alternatives + b")")
+    return re.compile(b"".join(parts), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=256)
+def _entry_predicate(
+    items: Tuple[Tuple[str, Union[str, bool]], ...],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> Optional[Callable[[Dict], bool]]:
+    """
+    Build a single check for the entries matching a set of filters.
+
+    Each filter shape gets its own closure, so the per-entry check neither
+    re-tests which filters are set nor loops over a list of checks. Closures
+    are cached, so a query repeated by a polling dashboard reuses them.
+
+    Args:
+        items: Required value of each top-level field, as (key, value) pairs
+        start: Earliest timestamp to include (ISO format)
+        end: Latest timestamp to include (ISO format)
+
+    Returns:
+        Predicate over parsed entries, or None if nothing is filtered
+    """
+    keys = tuple(key for key, _ in items)
+    values = tuple(value for _, value in items)
+    if not (start or end):
+        if not items:
+            return None
+        if len(items) == 1:
+            key, value = items[0]
+            return lambda log: log.get(key) == value
+        return lambda log: tuple(map(log.get, keys)) == values
+
+    # An open end compares above every ISO timestamp
+    earliest, latest = start or "", end or "\U0010ffff"
+    if not items:
+        return lambda log: earliest <= log.get("timestamp", "") <= latest
+    return lambda log: (
+        earliest <= log.get("timestamp", "") <= latest and tuple(map(log.get, keys)) == values
+    )
+
+
+def _fast_time(timestamp: str) -> str:
+    """
+    Format a log timestamp as HH:MM:SS.
+
+    Log timestamps are ISO-8601 (``YYYY-MM-DDTHH:MM:SS...``), so the time is
+    sliced out directly; anything else goes through the full parser, whose
+    results are memoized since many rows share a timestamp.
+
+    Args:
+        timestamp: Timestamp string from a log entry
+
+    Returns:
+        Time of day, or the (truncated) raw timestamp if it can't be parsed
+    """
+    if len(timestamp) >= 19 and timestamp[10] == "T" and timestamp[13] == ":":
+        return timestamp[11:19]
+    return _parse_time(timestamp)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_time(timestamp: str) -> str:
+    """Format a non-standard timestamp as HH:MM:SS (see _fast_time)."""
+    try:
+        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        return dt.strftime("%H:%M:%S")
+    except ValueError:
+        return timestamp[:19]
+
+
+def _start_time(session: Dict) -> str:
+    """Sort key ordering session summaries by start time."""
+    return session.get("start_time", "")
+
+
+def _llm_request_row(log: Dict, time_str: str) -> List[str]:
+    """Build the LLM call table row for an llm_request entry."""
+    get = log.get
+    return [
+        time_str,
+        "Request",
+        get("provider", ""),
+        _trunc(get("user_input", "")),
+        "-",
+        "-",
+        "-",
+        "⏳",
+    ]
+
+
+def _llm_response_row(log: Dict, time_str: str) -> List[str]:
+    """Build the LLM call table row for an llm_response entry."""
+    get = log.get
+    success = get("success", False)
+    status = "✅" if success else "❌"
+
+    command_or_error = get("generated_command", "")[:50] if success else get("error", "")[:50]
+
+    tokens = get("token_usage", {})
+    tokens_str = (
+        "%s→%s" % (tokens.get("input_tokens", 0), tokens.get("output_tokens", "?"))
+        if tokens
+        else "-"
+    )
+
+    return [
+        time_str,
+        "Response",
+        "-",
+        "-",
+        command_or_error,
+        "%.0f" % get("response_time_ms", 0),
+        tokens_str,
+        status,
+    ]
+
+
+def _validation_row(log: Dict, time_str: str) -> List[str]:
+    """Build the execution table row for a command_validation entry."""
+    get = log.get
+    result = get("validation_result", "")
+    status = "✅" if result == "passed" else "❌"
+
+    return [
+        time_str,
+        "Validation",
+        _trunc(get("command", "")),
+        result,
+        "-",
+        "-",
+        status,
+    ]
+
+
+def _execution_result_row(log: Dict, time_str: str) -> List[str]:
+    """Build the execution table row for a command_execution entry."""
+    get = log.get
+    success = get("success", False)
+    status = "✅" if success else "❌"
+
+    result = "Success" if success else get("error_message", "Failed")
+
+    output_file = get("output_file", "-")
+    if output_file and output_file != "-":
+        output_file = os.path.basename(output_file)
+
+    return [
+        time_str,
+        "Execution",
+        _trunc(get("command", "")),
+        result[:30],
+        "%.0f" % get("execution_time_ms", 0),
+        output_file,
+        status,
+    ]
+
+
+def _feedback_row(log: Dict, time_str: str) -> List[str]:
+    """Build the execution table row for a user_feedback entry."""
+    get = log.get
+    feedback = get("feedback", "")
+    status = "👍" if feedback == "liked" else "👎"
+
+    output_file = get("output_file", "-")
+    if output_file and output_file != "-":
+        output_file = os.path.basename(output_file)
+
+    return [
+        time_str,
+        "Feedback",
+        _trunc(get("command", "")),
+        feedback.capitalize(),
+        "-",
+        output_file,
+        status,
+    ]
+
+
+def _unified_llm_request_row(log: Dict, session: str, time_str: str) -> List[str]:
+    """Build the unified table row for an llm_request entry."""
+    get = log.get
+    return [
+        session,
+        time_str,
+        "LLM",
+        "Request",
+        "Provider: %s | Input: %s" % (get("provider", ""), get("user_input", "")),
+        "⏳",
+    ]
+
+
+def _unified_llm_response_row(log: Dict, session: str, time_str: str) -> List[str]:
+    """Build the unified table row for an llm_response entry."""
+    get = log.get
+    success = get("success", False)
+    status = "✅" if success else "❌"
+    command = get("generated_command", get("error", ""))
+    tokens = get("token_usage", {})
+    token_str = (
+        "%s→%s" % (tokens.get("input_tokens", 0), tokens.get("output_tokens", "?"))
+        if tokens
+        else ""
+    )
+
+    return [
+        session,
+        time_str,
+        "LLM",
+        "Response",
+        "Command: %s | Tokens: %s | %.0fms" % (command, token_str, get("response_time_ms", 0)),
+        status,
+    ]
+
+
+def _unified_validation_row(log: Dict, session: str, time_str: str) -> List[str]:
+    """Build the unified table row for a command_validation entry."""
+    get = log.get
+    result = get("validation_result", "")
+    status = "✅" if result == "passed" else "❌"
+    command = get("command", "")
+    error_msg = get("error_message", "")
+    details = f"Command: {command}"
+    if error_msg:
+        details += f" | Error: {error_msg}"
+
+    return [
+        session,
+        time_str,
+        "Exec",
+        "Validation",
+        details,
+        status,
+    ]
+
+
+def _unified_execution_row(log: Dict, session: str, time_str: str) -> List[str]:
+    """Build the unified table row for a command_execution entry."""
+    get = log.get
+    success = get("success", False)
+    status = "✅" if success else "❌"
+    output_file = get("output_file", "")
+    if output_file:
+        output_file = os.path.basename(output_file)
+
+    details = "Command: %s | Output: %s | %.0fms" % (
+        get("command", ""),
+        output_file or "N/A",
+        get("execution_time_ms", 0),
+    )
+
+    if not success:
+        error_msg = get("error_message", "")
+        if error_msg:
+            details += f" | Error: {error_msg}"
+
+    return [
+        session,
+        time_str,
+        "Exec",
+        "Execution",
+        details,
+        status,
+    ]
+
+
+def _unified_feedback_row(log: Dict, session: str, time_str: str) -> List[str]:
+    """Build the unified table row for a user_feedback entry."""
+    get = log.get
+    feedback = get("feedback", "")
+    status = "👍" if feedback == "liked" else "👎"
+    output_file = get("output_file", "")
+    if output_file:
+        output_file = os.path.basename(output_file)
+
+    command = get("command", "")
+    return [
+        session,
+        time_str,
+        "Feedback",
+        feedback.capitalize(),
+        f"Command: {command} | Output: {output_file or 'N/A'}",
+        status,
+    ]
+
+
+# Row builders by event; events without a builder get no row
+_LLM_ROW_BUILDERS: Dict[str, Callable[[Dict, str], List[str]]] = {
+    "llm_request": _llm_request_row,
+    "llm_response": _llm_response_row,
+}
+_EXECUTION_ROW_BUILDERS: Dict[str, Callable[[Dict, str], List[str]]] = {
+    "command_validation": _validation_row,
+    "command_execution": _execution_result_row,
+    "user_feedback": _feedback_row,
+}
+_UNIFIED_ROW_BUILDERS: Dict[Tuple[str, str], Callable[[Dict, str, str], List[str]]] = {
+    ("llm", "llm_request"): _unified_llm_request_row,
+    ("llm", "llm_response"): _unified_llm_response_row,
+    ("execution", "command_validation"): _unified_validation_row,
+    ("execution", "command_execution"): _unified_execution_row,
+    ("execution", "user_feedback"): _unified_feedback_row,
+}
+
+
+def _llm_call_row(log: Dict) -> Optional[List[str]]:
+    """Build the LLM call table row for a log entry (None for other events)."""
+    builder = _LLM_ROW_BUILDERS.get(log.get("event", ""))
+    if builder is None:
+        return None
+    return builder(log, _fast_time(log.get("timestamp", "")))
+
+
+def _execution_row(log: Dict) -> Optional[List[str]]:
+    """Build the execution table row for a log entry (None for other events)."""
+    builder = _EXECUTION_ROW_BUILDERS.get(log.get("event", ""))
+    if builder is None:
+        return None
+    return builder(log, _fast_time(log.get("timestamp", "")))
+
+
+def _unified_row(log: Dict) -> Optional[List[str]]:
+    """Build the unified table row for a log entry (None for other events)."""
+    get = log.get
+    builder = _UNIFIED_ROW_BUILDERS.get((get("log_type", ""), get("event", "")))
+    if builder is None:
+        return None
+
+    # Session display (show first 8 chars of UUID)
+    session_id = get("session_id", "unknown")
+    session_display = session_id[:8] if session_id != "unknown" else "unknown"
+
+    return builder(log, session_display, _fast_time(get("timestamp", "")))
+
+
+@dataclass
+class _ParsedLog:
+    """Parsed entries of one log file and where parsing stopped."""
+
+    inode: int
+    mtime_ns: int
+    size: int
+    # Offset just past the last complete line parsed
+    offset: int
+    entries: List[Dict] = field(default_factory=list)
+    by_session: Dict[str, List[Dict]] = field(default_factory=dict)
+    # Timestamp of each entry ("" if missing), for binary search by time
+    timestamps: List[str] = field(default_factory=list)
+    # Whether timestamps are non-decreasing, i.e. can be binary searched
+    ordered: bool = True
+
+
+@dataclass
+class _Totals:
+    """Running totals behind the stats dict, updated one entry at a time."""
+
+    llm_total: int = 0
+    llm_ok: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    rt_sum: float = 0.0
+    rt_count: int = 0
+    exec_total: int = 0
+    exec_ok: int = 0
+    et_sum: float = 0.0
+    et_count: int = 0
+    feedback_total: int = 0
+    liked: int = 0
+    disliked: int = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Build the stats dict reported by get_stats."""
+        return {
+            "llm_calls": {
+                "total": self.llm_total,
+                "successful": self.llm_ok,
+                "failed": self.llm_total - self.llm_ok,
+                "avg_response_time_ms": (
+                    round(self.rt_sum / self.rt_count, 2) if self.rt_count else 0
+                ),
+                "total_tokens": {"input": self.tokens_in, "output": self.tokens_out},
+            },
+            "executions": {
+                "total": self.exec_total,
+                "successful": self.exec_ok,
+                "failed": self.exec_total - self.exec_ok,
+                "avg_execution_time_ms": (
+                    round(self.et_sum / self.et_count, 2) if self.et_count else 0
+                ),
+            },
+            "feedback": {
+                "total": self.feedback_total,
+                "liked": self.liked,
+                "disliked": self.disliked,
+            },
+        }
+
+
+@dataclass
+class ScanResult:
+    """Aggregates computed from one pass over both log files."""
+
+    stats: Dict
+    # Session summaries keyed by session ID, in order of first appearance
+    sessions: Dict[str, Dict]
+    llm_logs: List[Dict]
+    exec_logs: List[Dict]
+    # How many entries of each list the aggregates cover
+    llm_count: int
+    exec_count: int
+    totals: _Totals
 
 
 class LogReader:
@@ -25,6 +663,256 @@ class LogReader:
         self.llm_log_file = self.log_dir / "llm_calls.jsonl"
         self.exec_log_file = self.log_dir / "executions.jsonl"
         self.app_log_file = self.log_dir / "app.log"
+        # Parsed entries per file
+        self._cache: Dict[Path, _ParsedLog] = {}
+        # One lock per file, so parsing one log never blocks readers of the other
+        self._file_locks = {
+            self.llm_log_file: threading.Lock(),
+            self.exec_log_file: threading.Lock(),
+        }
+        self._scan: Optional[ScanResult] = None
+        self._scan_lock = threading.Lock()
+
+    def _read_parsed(self, path: Path) -> List[Dict]:
+        """
+        Get all parsed entries of a log file, parsing only what is new.
+
+        Entries are cached per file together with the byte offset parsed so
+        far. While the file only grows, later calls parse just the appended
+        lines; if it is replaced, truncated or rewritten it is parsed again
+        from the start. A trailing line without a newline is still being
+        written and is left for the next call.
+
+        Args:
+            path: Log file to read
+
+        Returns:
+            Parsed entries in file order. The list and its entries are shared
+            with the cache and must not be modified.
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            with self._file_locks[path]:
+                self._cache.pop(path, None)
+            return []
+
+        with self._file_locks[path]:
+            parsed = self._cache.get(path)
+            if parsed is not None:
+                if (
+                    parsed.inode == st.st_ino
+                    and parsed.mtime_ns == st.st_mtime_ns
+                    and parsed.size == st.st_size
+                ):
+                    return parsed.entries
+                if (
+                    parsed.inode != st.st_ino
+                    or st.st_mtime_ns < parsed.mtime_ns
+                    or st.st_size < parsed.offset
+                ):
+                    parsed = None
+
+            if parsed is None:
+                parsed = _ParsedLog(st.st_ino, st.st_mtime_ns, st.st_size, offset=0)
+
+            entries = parsed.entries
+            by_session = parsed.by_session
+            timestamps = parsed.timestamps
+            last = timestamps[-1] if timestamps else ""
+            offset = parsed.offset
+            for line, offset in _iter_jsonl_bytes(path, offset):
+                try:
+                    entry = _intern_fields(_loads(line))
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    session_id = entry.get("session_id")
+                    timestamp = entry.get("timestamp")
+                    if type(timestamp) is not str:
+                        timestamp = ""
+                else:
+                    session_id = None
+                    timestamp = ""
+                if timestamp < last:
+                    # Published right away, before the entry, for concurrent readers
+                    parsed.ordered = False
+                last = timestamp
+                # The timestamp goes in first: readers bound searches by len(entries)
+                timestamps.append(timestamp)
+                entries.append(entry)
+                if session_id:
+                    by_session.setdefault(session_id, []).append(entry)
+
+            parsed.inode = st.st_ino
+            parsed.mtime_ns = st.st_mtime_ns
+            parsed.size = st.st_size
+            parsed.offset = offset
+            self._cache[path] = parsed
+            return entries
+
+    def etag(self) -> str:
+        """
+        Get a tag that changes whenever either log file changes.
+
+        It is derived from the inode, size and modification time of each
+        file, so it costs two stat calls and no reading.
+
+        Returns:
+            Short hex digest identifying the current state of the logs
+        """
+        state = []
+        for path in (self.llm_log_file, self.exec_log_file):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                state.append("-")
+                continue
+            state.append(f"{st.st_ino}:{st.st_size}:{st.st_mtime_ns}")
+        return hashlib.blake2b("/".join(state).encode(), digest_size=8).hexdigest()
+
+    def tail_bytes(self, path: Path, n_lines: int) -> Tuple[int, int]:
+        """
+        Locate the last complete lines of a log file without parsing them.
+
+        The file is scanned backwards in blocks for newlines, so the cost
+        depends on ``n_lines``, not on the file size. A trailing line
+        without a newline is still being written and is left out.
+
+        Args:
+            path: Log file to read
+            n_lines: Number of lines to include
+
+        Returns:
+            Tuple of (byte offset, length) of the range holding the lines
+        """
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return 0, 0
+
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            # Offset just past the last newline, i.e. the end of the range
+            end = -1
+            count = 0
+            while pos > 0 and count < n_lines:
+                size = min(_BLOCK_SIZE, pos)
+                pos -= size
+                f.seek(pos)
+                block = f.read(size)
+                nl = len(block)
+                while True:
+                    nl = block.rfind(b"\n", 0, nl)
+                    if nl == -1:
+                        break
+                    if end == -1:
+                        end = pos + nl + 1
+                        continue
+                    count += 1
+                    if count == n_lines:
+                        return pos + nl + 1, end - (pos + nl + 1)
+
+        if end == -1 or n_lines <= 0:
+            return 0, 0
+        return 0, end
+
+    def _iter_recent(
+        self,
+        path: Path,
+        required: Tuple[Tuple[bytes, ...], ...] = (),
+        session_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """
+        Yield parsed entries of a log file, most recent first.
+
+        Files that are already cached are brought up to date and walked
+        backwards, starting and stopping at the requested time range found
+        by binary search. Otherwise only the tail of the file is read and
+        parsed, as far as the caller consumes, instead of parsing the whole
+        file. Raw lines that can't match the caller's filters are skipped
+        unparsed.
+
+        Args:
+            path: Log file to read
+            required: Byte patterns from _field_needles; a raw line is only
+                parsed if it contains at least one pattern of every group.
+                Callers must still check parsed entries against their filters.
+            session_id: If given, cached files yield only this session's
+                entries, looked up in the per-session index
+            start: Earliest timestamp wanted (ISO format)
+            end: Latest timestamp wanted (ISO format)
+
+        Yields:
+            Parsed log entries, newest first. Callers must still check
+            entries against the time range.
+        """
+        if path in self._cache:
+            entries = self._read_parsed(path)
+            parsed = self._cache.get(path)
+            if parsed is None:
+                return
+            if session_id:
+                yield from reversed(parsed.by_session.get(session_id, []))
+                return
+
+            lo, hi = 0, len(entries)
+            if parsed.ordered and (start or end):
+                timestamps = parsed.timestamps
+                if start:
+                    lo = bisect.bisect_left(timestamps, start, 0, hi)
+                if end:
+                    hi = bisect.bisect_right(timestamps, end, lo, hi)
+            for i in range(hi - 1, lo - 1, -1):
+                yield entries[i]
+            return
+
+        # Check the longest (most specific) patterns first: a session ID
+        # rejects almost every line, so the other groups are rarely scanned
+        required = tuple(sorted(required, key=lambda group: -len(group[0])))
+        for line in _iter_lines_reverse(path):
+            if required and not all(any(n in line for n in group) for group in required):
+                continue
+            try:
+                yield _intern_fields(_loads(line))
+            except ValueError:
+                continue
+
+    def _iter_filtered(
+        self,
+        path: Path,
+        filters: Dict[str, Union[str, bool]],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """
+        Yield the entries of a log file matching field filters, most recent first.
+
+        Raw lines are prefiltered on each field's byte patterns, and a
+        session_id filter uses the per-session index of cached files.
+
+        Args:
+            path: Log file to read
+            filters: Required value of each top-level field
+            start: Earliest timestamp to include (ISO format)
+            end: Latest timestamp to include (ISO format)
+
+        Yields:
+            Matching log entries, newest first
+        """
+        required = tuple(_field_needles(key, value) for key, value in filters.items())
+        session_id = filters.get("session_id")
+        if not isinstance(session_id, str):
+            session_id = None
+        logs = self._iter_recent(path, required, session_id, start, end)
+
+        predicate = _entry_predicate(tuple(filters.items()), start, end)
+        if predicate is None:
+            yield from logs
+        else:
+            yield from filter(predicate, logs)
 
     def get_llm_calls(
         self,
@@ -32,6 +920,8 @@ class LogReader:
         provider: Optional[str] = None,
         success: Optional[bool] = None,
         session_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
     ) -> List[Dict]:
         """
         Get LLM call logs with optional filtering.
@@ -41,44 +931,30 @@ class LogReader:
             provider: Filter by provider (anthropic, openai, google)
             success: Filter by success status
             session_id: Filter by session ID
+            start: Earliest timestamp to include (ISO format)
+            end: Latest timestamp to include (ISO format)
 
         Returns:
             List of log entries (most recent first)
         """
-        logs = []
-
-        if not self.llm_log_file.exists():
-            return logs
+        filters: Dict[str, Union[str, bool]] = {}
+        if provider:
+            filters["provider"] = provider
+        if success is not None:
+            filters["success"] = success
+        if session_id:
+            filters["session_id"] = session_id
 
-        with open(self.llm_log_file, "r") as f:
-            for line in f:
-                try:
-                    log = json.loads(line.strip())
-
-                    # Apply filters
-                    if provider and log.get("provider") != provider:
-                        continue
-                    if success is not None and log.get("success") != success:
-                        continue
-                    if session_id and log.get("session_id") != session_id:
-                        continue
-
-                    logs.append(log)
-
-                    if len(logs) >= limit:
-                        break
-                except json.JSONDecodeError:
-                    continue
-
-        # Return most recent first
-        logs.reverse()
-        return logs
+        logs = self._iter_filtered(self.llm_log_file, filters, start, end)
+        return list(itertools.islice(logs, limit))
 
     def get_executions(
         self,
         limit: int = 100,
         success: Optional[bool] = None,
         session_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
     ) -> List[Dict]:
         """
         Get command execution logs with optional filtering.
@@ -87,35 +963,200 @@ class LogReader:
             limit: Maximum number of entries to return
             success: Filter by success status
             session_id: Filter by session ID
+            start: Earliest timestamp to include (ISO format)
+            end: Latest timestamp to include (ISO format)
 
         Returns:
             List of log entries (most recent first)
         """
-        logs = []
+        filters: Dict[str, Union[str, bool]] = {}
+        if success is not None:
+            filters["success"] = success
+        if session_id:
+            filters["session_id"] = session_id
 
-        if not self.exec_log_file.exists():
-            return logs
+        logs = self._iter_filtered(self.exec_log_file, filters, start, end)
+        return list(itertools.islice(logs, limit))
 
-        with open(self.exec_log_file, "r") as f:
-            for line in f:
-                try:
-                    log = json.loads(line.strip())
+    def search(self, query: str, log_type: str = "all", limit: int = 50) -> List[Dict]:
+        """
+        Search log entries by text content.
 
-                    # Apply filters
-                    if success is not None and log.get("success") != success:
-                        continue
-                    if session_id and log.get("session_id") != session_id:
-                        continue
+        Raw lines are matched with a compiled pattern, newest first, and
+        only matching lines are parsed.
 
-                    logs.append(log)
+        Args:
+            query: Case-insensitive text to look for anywhere in an entry
+            log_type: Log to search (llm, execution, or all)
+            limit: Maximum number of entries to return
 
-                    if len(logs) >= limit:
-                        break
-                except json.JSONDecodeError:
+        Returns:
+            Matching entries tagged with their log_type, LLM calls before
+            executions, each most recent first
+        """
+        search = _search_pattern(query).search
+        sources = [
+            (self.llm_log_file, "llm"),
+            (self.exec_log_file, "execution"),
+        ]
+
+        results: List[Dict] = []
+        for path, source_type in sources:
+            if log_type not in (source_type, "all"):
+                continue
+            # Match the raw lines and only parse the hits
+            for line in _iter_lines_reverse(path):
+                if search(line) is None:
+                    continue
+                try:
+                    log = _loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(log, dict):
                     continue
+                log["log_type"] = source_type
+                results.append(log)
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def _scan_all(self) -> "ScanResult":
+        """
+        Compute stats and sessions over both log files.
+
+        The result is memoized until either log file changes. While the files
+        only grow, the running totals of the previous result are carried over
+        and just the newly parsed entries are folded in, so a dashboard
+        refresh costs time proportional to what was appended, not to the
+        size of the logs.
+
+        Returns:
+            Shared scan result; callers must not modify it
+        """
+        llm_logs = self._read_parsed(self.llm_log_file)
+        exec_logs = self._read_parsed(self.exec_log_file)
+
+        with self._scan_lock:
+            prev = self._scan
+            # Cached entry lists only ever grow in place or get replaced, and
+            # the memoized result keeps them alive, so identity + length pins
+            # the content
+            if prev is not None and prev.llm_logs is llm_logs and prev.exec_logs is exec_logs:
+                if prev.llm_count == len(llm_logs) and prev.exec_count == len(exec_logs):
+                    return prev
+                totals = replace(prev.totals)
+                sessions = dict(prev.sessions)
+                llm_start, exec_start = prev.llm_count, prev.exec_count
+            else:
+                totals = _Totals()
+                sessions = {}
+                llm_start = exec_start = 0
+
+            self._fold_llm(totals, itertools.islice(llm_logs, llm_start, None))
+            self._fold_exec(totals, sessions, itertools.islice(exec_logs, exec_start, None))
+
+            self._scan = ScanResult(
+                stats=totals.stats(),
+                sessions=sessions,
+                llm_logs=llm_logs,
+                exec_logs=exec_logs,
+                llm_count=len(llm_logs),
+                exec_count=len(exec_logs),
+                totals=totals,
+            )
+            return self._scan
+
+    @staticmethod
+    def _fold_llm(totals: _Totals, logs: Iterable[Dict]) -> None:
+        """Add LLM call entries to the running totals."""
+        # Counters live in locals while scanning and are written back once
+        llm_total, llm_ok = totals.llm_total, totals.llm_ok
+        tokens_in, tokens_out = totals.tokens_in, totals.tokens_out
+        rt_sum, rt_count = totals.rt_sum, totals.rt_count
+        for log in logs:
+            if log.get("event") == "llm_response":
+                llm_total += 1
+                if log.get("success"):
+                    llm_ok += 1
+
+                if "response_time_ms" in log:
+                    rt_sum += log["response_time_ms"]
+                    rt_count += 1
+
+                token_usage = log.get("token_usage")
+                if token_usage:
+                    tokens_in += token_usage.get("input_tokens", 0)
+                    tokens_out += token_usage.get("output_tokens", 0)
+
+        totals.llm_total, totals.llm_ok = llm_total, llm_ok
+        totals.tokens_in, totals.tokens_out = tokens_in, tokens_out
+        totals.rt_sum, totals.rt_count = rt_sum, rt_count
+
+    @staticmethod
+    def _fold_exec(totals: _Totals, sessions: Dict[str, Dict], logs: Iterable[Dict]) -> None:
+        """Add execution and feedback entries to the running totals and sessions."""
+        exec_total, exec_ok = totals.exec_total, totals.exec_ok
+        et_sum, et_count = totals.et_sum, totals.et_count
+        feedback_total, liked, disliked = totals.feedback_total, totals.liked, totals.disliked
+        # Summaries carried over from the previous result are shared with it,
+        # so each is copied before its first update
+        updated = set()
+        for log in logs:
+            event = log.get("event")
+            if event == "command_execution":
+                exec_total += 1
+                if log.get("success"):
+                    exec_ok += 1
+
+                if "execution_time_ms" in log:
+                    et_sum += log["execution_time_ms"]
+                    et_count += 1
+            elif event == "user_feedback":
+                feedback_total += 1
+                feedback = log.get("feedback")
+                if feedback == "liked":
+                    liked += 1
+                elif feedback == "disliked":
+                    disliked += 1
+
+            session_id = log.get("session_id")
+            if not session_id:
+                continue
+
+            # Track session metadata
+            if session_id not in updated:
+                updated.add(session_id)
+                session = sessions.get(session_id)
+                sessions[session_id] = (
+                    dict(session)
+                    if session is not None
+                    else {
+                        "session_id": session_id,
+                        "start_time": log.get("timestamp"),
+                        "command_count": 0,
+                    }
+                )
+            session = sessions[session_id]
 
-        logs.reverse()
-        return logs
+            # Count command executions (not validations or feedback)
+            if event == "command_execution":
+                session["command_count"] += 1
+
+            # Update to latest timestamp
+            session["last_activity"] = log.get("timestamp")
+
+        totals.exec_total, totals.exec_ok = exec_total, exec_ok
+        totals.et_sum, totals.et_count = et_sum, et_count
+        totals.feedback_total, totals.liked, totals.disliked = feedback_total, liked, disliked
+
+    def refresh(self) -> None:
+        """
+        Bring the cached entries, stats and sessions up to date with the logs.
+
+        Lets a background thread take the parsing cost, so queries only
+        fold in whatever was written since the last refresh.
+        """
+        self._scan_all()
 
     def get_stats(self) -> Dict:
         """
@@ -124,90 +1165,37 @@ class LogReader:
         Returns:
             Dictionary with statistics for LLM calls and executions
         """
-        stats = {
-            "llm_calls": {
-                "total": 0,
-                "successful": 0,
-                "failed": 0,
-                "avg_response_time_ms": 0,
-                "total_tokens": {"input": 0, "output": 0},
-            },
-            "executions": {
-                "total": 0,
-                "successful": 0,
-                "failed": 0,
-                "avg_execution_time_ms": 0,
-            },
-            "feedback": {
-                "total": 0,
-                "liked": 0,
-                "disliked": 0,
-            },
-        }
-
-        # Process LLM calls
-        if self.llm_log_file.exists():
-            response_times = []
-            with open(self.llm_log_file, "r") as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-                        if log.get("event") == "llm_response":
-                            stats["llm_calls"]["total"] += 1
-                            if log.get("success"):
-                                stats["llm_calls"]["successful"] += 1
-                            else:
-                                stats["llm_calls"]["failed"] += 1
-
-                            if "response_time_ms" in log:
-                                response_times.append(log["response_time_ms"])
-
-                            if "token_usage" in log and log["token_usage"]:
-                                stats["llm_calls"]["total_tokens"]["input"] += log[
-                                    "token_usage"
-                                ].get("input_tokens", 0)
-                                stats["llm_calls"]["total_tokens"]["output"] += log[
-                                    "token_usage"
-                                ].get("output_tokens", 0)
-                    except json.JSONDecodeError:
-                        continue
+        return copy.deepcopy(self._scan_all().stats)
 
-            if response_times:
-                stats["llm_calls"]["avg_response_time_ms"] = round(
-                    sum(response_times) / len(response_times), 2
-                )
-
-        # Process executions and feedback
-        if self.exec_log_file.exists():
-            execution_times = []
-            with open(self.exec_log_file, "r") as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-                        if log.get("event") == "command_execution":
-                            stats["executions"]["total"] += 1
-                            if log.get("success"):
-                                stats["executions"]["successful"] += 1
-                            else:
-                                stats["executions"]["failed"] += 1
-
-                            if "execution_time_ms" in log:
-                                execution_times.append(log["execution_time_ms"])
-                        elif log.get("event") == "user_feedback":
-                            stats["feedback"]["total"] += 1
-                            if log.get("feedback") == "liked":
-                                stats["feedback"]["liked"] += 1
-                            elif log.get("feedback") == "disliked":
-                                stats["feedback"]["disliked"] += 1
-                    except json.JSONDecodeError:
-                        continue
+    def get_counts_fast(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count LLM calls and executions without parsing the logs.
 
-            if execution_times:
-                stats["executions"]["avg_execution_time_ms"] = round(
-                    sum(execution_times) / len(execution_times), 2
-                )
+        The totals and success/failure counts of get_stats are computed by
+        counting field patterns in the raw bytes. Log files are rotated at a
+        few megabytes, so each is read in one go. Use get_stats when averages
+        or token totals are needed.
 
-        return stats
+        Returns:
+            Dictionary with total/successful/failed counts for LLM calls and
+            executions
+        """
+        counts = {}
+        for name, path, event in (
+            ("llm_calls", self.llm_log_file, "llm_response"),
+            ("executions", self.exec_log_file, "command_execution"),
+        ):
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                data = b""
+            # Only the counted event carries a "success" field
+            counts[name] = {
+                "total": _count_field(data, "event", event),
+                "successful": _count_field(data, "success", True),
+                "failed": _count_field(data, "success", False),
+            }
+        return counts
 
     def format_llm_calls_for_display(
         self, logs: List[Dict]
@@ -232,60 +1220,7 @@ class LogReader:
             "Status",
         ]
 
-        table_data = []
-        for log in logs:
-            event = log.get("event", "")
-            timestamp = log.get("timestamp", "")
-
-            # Format timestamp
-            try:
-                dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                time_str = dt.strftime("%H:%M:%S")
-            except:
-                time_str = timestamp[:19] if len(timestamp) >= 19 else timestamp
-
-            if event == "llm_request":
-                table_data.append(
-                    [
-                        time_str,
-                        "Request",
-                        log.get("provider", ""),
-                        log.get("user_input", "")[:50] + "...",
-                        "-",
-                        "-",
-                        "-",
-                        "⏳",
-                    ]
-                )
-            elif event == "llm_response":
-                success = log.get("success", False)
-                status = "✅" if success else "❌"
-
-                command_or_error = (
-                    log.get("generated_command", "")[:50]
-                    if success
-                    else log.get("error", "")[:50]
-                )
-
-                token_usage = log.get("token_usage", {})
-                tokens_str = (
-                    f"{token_usage.get('input_tokens', 0)}→{token_usage.get('output_tokens', 0)}"
-                    if token_usage
-                    else "-"
-                )
-
-                table_data.append(
-                    [
-                        time_str,
-                        "Response",
-                        "-",
-                        "-",
-                        command_or_error,
-                        f"{log.get('response_time_ms', 0):.0f}",
-                        tokens_str,
-                        status,
-                    ]
-                )
+        table_data = [row for row in map(_llm_call_row, logs) if row is not None]
 
         return table_data, headers
 
@@ -311,121 +1246,29 @@ class LogReader:
             "Status",
         ]
 
-        table_data = []
-        for log in logs:
-            event = log.get("event", "")
-            timestamp = log.get("timestamp", "")
-
-            # Format timestamp
-            try:
-                dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                time_str = dt.strftime("%H:%M:%S")
-            except:
-                time_str = timestamp[:19] if len(timestamp) >= 19 else timestamp
-
-            if event == "command_validation":
-                result = log.get("validation_result", "")
-                status = "✅" if result == "passed" else "❌"
-
-                table_data.append(
-                    [
-                        time_str,
-                        "Validation",
-                        log.get("command", "")[:50] + "...",
-                        result,
-                        "-",
-                        "-",
-                        status,
-                    ]
-                )
-            elif event == "command_execution":
-                success = log.get("success", False)
-                status = "✅" if success else "❌"
-
-                result = "Success" if success else log.get("error_message", "Failed")
-
-                output_file = log.get("output_file", "-")
-                if output_file and output_file != "-":
-                    output_file = Path(output_file).name
-
-                table_data.append(
-                    [
-                        time_str,
-                        "Execution",
-                        log.get("command", "")[:50] + "...",
-                        result[:30],
-                        f"{log.get('execution_time_ms', 0):.0f}",
-                        output_file,
-                        status,
-                    ]
-                )
-            elif event == "user_feedback":
-                feedback = log.get("feedback", "")
-                status = "👍" if feedback == "liked" else "👎"
-
-                output_file = log.get("output_file", "-")
-                if output_file and output_file != "-":
-                    output_file = Path(output_file).name
-
-                table_data.append(
-                    [
-                        time_str,
-                        "Feedback",
-                        log.get("command", "")[:50] + "...",
-                        feedback.capitalize(),
-                        "-",
-                        output_file,
-                        status,
-                    ]
-                )
+        table_data = [row for row in map(_execution_row, logs) if row is not None]
 
         return table_data, headers
 
-    def get_sessions(self) -> List[Dict]:
+    def get_sessions(self, limit: Optional[int] = None) -> List[Dict]:
         """
         Get all unique sessions from execution logs.
 
+        Args:
+            limit: Maximum number of sessions to return (all if None)
+
         Returns:
             List of session dictionaries with metadata (session_id, start_time, command_count)
             Sorted by most recent first
         """
-        sessions = {}
-
-        if not self.exec_log_file.exists():
-            return []
+        sessions = self._scan_all().sessions.values()
+        if limit is None:
+            session_list = sorted(sessions, key=_start_time, reverse=True)
+        else:
+            # Partial selection is O(n log limit) instead of sorting everything
+            session_list = heapq.nlargest(limit, sessions, key=_start_time)
 
-        with open(self.exec_log_file, "r") as f:
-            for line in f:
-                try:
-                    log = json.loads(line.strip())
-                    session_id = log.get("session_id")
-
-                    if not session_id:
-                        continue
-
-                    # Track session metadata
-                    if session_id not in sessions:
-                        sessions[session_id] = {
-                            "session_id": session_id,
-                            "start_time": log.get("timestamp"),
-                            "command_count": 0,
-                        }
-
-                    # Count command executions (not validations or feedback)
-                    if log.get("event") == "command_execution":
-                        sessions[session_id]["command_count"] += 1
-
-                    # Update to latest timestamp
-                    sessions[session_id]["last_activity"] = log.get("timestamp")
-
-                except json.JSONDecodeError:
-                    continue
-
-        # Convert to list and sort by start time (most recent first)
-        session_list = list(sessions.values())
-        session_list.sort(key=lambda x: x.get("start_time", ""), reverse=True)
-
-        return session_list
+        return [dict(session) for session in session_list]
 
     def get_unified_logs(
         self,
@@ -435,6 +1278,10 @@ class LogReader:
         """
         Get unified logs combining LLM calls and command executions.
 
+        Each file is written in time order, so both are walked newest first
+        and merged, stopping after ``limit`` entries instead of sorting
+        everything.
+
         Args:
             limit: Maximum number of entries to return
             session_id: Filter by session ID
@@ -442,41 +1289,20 @@ class LogReader:
         Returns:
             List of log entries (most recent first), sorted by timestamp
         """
-        all_logs = []
-
-        # Get LLM call logs
-        if self.llm_log_file.exists():
-            with open(self.llm_log_file, "r") as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-                        # Apply session filter
-                        if session_id and log.get("session_id") != session_id:
-                            continue
-                        log["log_type"] = "llm"
-                        all_logs.append(log)
-                    except json.JSONDecodeError:
-                        continue
+        filters: Dict[str, Union[str, bool]] = {"session_id": session_id} if session_id else {}
 
-        # Get execution logs
-        if self.exec_log_file.exists():
-            with open(self.exec_log_file, "r") as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-                        # Apply session filter
-                        if session_id and log.get("session_id") != session_id:
-                            continue
-                        log["log_type"] = "execution"
-                        all_logs.append(log)
-                    except json.JSONDecodeError:
-                        continue
+        def tagged(path: Path, log_type: str) -> Iterator[Dict]:
+            for log in self._iter_filtered(path, filters):
+                # Copy so the cached entries aren't modified
+                yield {**log, "log_type": log_type}
 
-        # Sort by timestamp (most recent first)
-        all_logs.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-        # Apply limit
-        return all_logs[:limit]
+        merged = heapq.merge(
+            tagged(self.llm_log_file, "llm"),
+            tagged(self.exec_log_file, "execution"),
+            key=lambda log: log.get("timestamp", ""),
+            reverse=True,
+        )
+        return list(itertools.islice(merged, limit))
 
     def format_unified_logs_for_display(
         self, logs: List[Dict]
@@ -499,116 +1325,17 @@ class LogReader:
             "Status",
         ]
 
-        table_data = []
-        current_session = None
-
-        for log in logs:
-            event = log.get("event", "")
-            timestamp = log.get("timestamp", "")
-            session_id = log.get("session_id", "unknown")
-            log_type = log.get("log_type", "")
-
-            # Format timestamp
-            try:
-                dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                time_str = dt.strftime("%H:%M:%S")
-            except:
-                time_str = timestamp[:19] if len(timestamp) >= 19 else timestamp
-
-            # Session display (show first 8 chars of UUID)
-            session_display = session_id[:8] if session_id != "unknown" else "unknown"
-
-            # Add session separator if session changed
-            if session_id != current_session:
-                current_session = session_id
-                # Add a separator row
-                if table_data:  # Don't add separator before first session
-                    table_data.append(["════════", "════════", "════════", "════════", "════════", "════════"])
-
-            # Format based on log type and event
-            if log_type == "llm":
-                if event == "llm_request":
-                    user_input = log.get('user_input', '')
-                    table_data.append([
-                        session_display,
-                        time_str,
-                        "LLM",
-                        "Request",
-                        f"Provider: {log.get('provider', '')} | Input: {user_input}",
-                        "⏳",
-                    ])
-                elif event == "llm_response":
-                    success = log.get("success", False)
-                    status = "✅" if success else "❌"
-                    command = log.get("generated_command", log.get("error", ""))
-                    tokens = log.get("token_usage", {})
-                    token_str = f"{tokens.get('input_tokens', 0)}→{tokens.get('output_tokens', 0)}" if tokens else ""
-
-                    table_data.append([
-                        session_display,
-                        time_str,
-                        "LLM",
-                        "Response",
-                        f"Command: {command} | Tokens: {token_str} | {log.get('response_time_ms', 0):.0f}ms",
-                        status,
-                    ])
-
-            elif log_type == "execution":
-                if event == "command_validation":
-                    result = log.get("validation_result", "")
-                    status = "✅" if result == "passed" else "❌"
-                    command = log.get('command', '')
-                    error_msg = log.get("error_message", "")
-                    details = f"Command: {command}"
-                    if error_msg:
-                        details += f" | Error: {error_msg}"
-
-                    table_data.append([
-                        session_display,
-                        time_str,
-                        "Exec",
-                        "Validation",
-                        details,
-                        status,
-                    ])
-                elif event == "command_execution":
-                    success = log.get("success", False)
-                    status = "✅" if success else "❌"
-                    output_file = log.get("output_file", "")
-                    if output_file:
-                        output_file = Path(output_file).name
-
-                    command = log.get('command', '')
-                    details = f"Command: {command} | Output: {output_file or 'N/A'} | {log.get('execution_time_ms', 0):.0f}ms"
-
-                    if not success:
-                        error_msg = log.get("error_message", "")
-                        if error_msg:
-                            details += f" | Error: {error_msg}"
-
-                    table_data.append([
-                        session_display,
-                        time_str,
-                        "Exec",
-                        "Execution",
-                        details,
-                        status,
-                    ])
-                elif event == "user_feedback":
-                    feedback = log.get("feedback", "")
-                    status = "👍" if feedback == "liked" else "👎"
-                    output_file = log.get("output_file", "")
-                    if output_file:
-                        output_file = Path(output_file).name
-
-                    command = log.get('command', '')
-                    table_data.append([
-                        session_display,
-                        time_str,
-                        "Feedback",
-                        feedback.capitalize(),
-                        f"Command: {command} | Output: {output_file or 'N/A'}",
-                        status,
-                    ])
+        # Pair each row with its session, then put a divider row between
+        # consecutive runs of different sessions
+        rows = [
+            (log.get("session_id", "unknown"), row)
+            for log in logs
+            if (row := _unified_row(log)) is not None
+        ]
+        table_data: List[List[str]] = []
+        for i, (_, group) in enumerate(itertools.groupby(rows, key=itemgetter(0))):
+            if i:
+                table_data.append(list(_SEP_ROW))
+            table_data.extend(row for _, row in group)
 
         return table_data, headers
@@ -8,7 +8,7 @@ from pathlib import Path
 
 from rich.console import Console
 
-from .web_logs import run_server
+from .web_logs import DEFAULT_THREADS, run_server
 
 console = Console()
 
@@ -30,6 +30,12 @@ def main():
         default=5000,
         help="Port to run the web server on (default: 5000)",
     )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=DEFAULT_THREADS,
+        help=f"Worker threads, one per open live stream (default: {DEFAULT_THREADS})",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -46,7 +52,9 @@ def main():
         console.print("[yellow]It will be created when the agent starts logging.[/yellow]\n")
 
     try:
-        run_server(log_dir=args.log_dir, port=args.port, debug=args.debug)
+        run_server(
+            log_dir=args.log_dir, port=args.port, debug=args.debug, threads=args.threads
+        )
     except KeyboardInterrupt:
         console.print("\n[cyan]Shutting down log viewer...[/cyan]")
         sys.exit(0)
@@ -7,10 +7,158 @@ This module sets up structured logging for the application including:
 - Command execution audit trail
 """
 
+import atexit
+import gzip
+import json
 import logging
 import logging.handlers
+import os
+import queue
+import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+
+    def _dumps(data: Dict[str, Any]) -> str:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+except ImportError:
+
+    def _dumps(data: Dict[str, Any]) -> str:
+        return json.dumps(data, ensure_ascii=False)
+
+
+# Listeners writing queued records to disk, kept alive until exit
+_listeners: List[logging.handlers.QueueListener] = []
+
+
+class _BatchingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that writes records in batches.
+
+    emit() only buffers the record. flush() formats the buffered records and
+    writes them with one write per file, rotating partway through the batch
+    where the next record would take the file past maxBytes, as the stock
+    handler does. The stock handler checks the file size and flushes once per
+    record instead.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._pending: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._pending.append(record)
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            records, self._pending = self._pending, []
+            if records:
+                try:
+                    self._write_batch(records)
+                except Exception:
+                    self.handleError(records[-1])
+            super().flush()
+        finally:
+            self.release()
+
+    def _write_batch(self, records: List[logging.LogRecord]) -> None:
+        """Write formatted records, rotating wherever a file would pass maxBytes."""
+        if self.stream is None:
+            self.stream = self._open()
+        # Nothing but a regular file is rotated (e.g. not /dev/null)
+        rotate = self.maxBytes > 0 and os.path.isfile(self.baseFilename)
+        size = self.stream.tell()
+        lines: List[str] = []
+        for record in records:
+            line = self.format(record) + self.terminator
+            # An empty file is never rotated, however large the record
+            if rotate and size and size + len(line) >= self.maxBytes:
+                self.stream.write("".join(lines))
+                self.doRollover()
+                lines, size = [], self.stream.tell()
+            lines.append(line)
+            size += len(line)
+        self.stream.write("".join(lines))
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """Queue listener that flushes its handlers whenever the queue runs empty."""
+
+    def __init__(
+        self,
+        records: "queue.Queue[logging.LogRecord]",
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+    ):
+        super().__init__(records, *handlers, respect_handler_level=respect_handler_level)
+        self._records = records
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        # A burst of records is written together, but nothing waits for
+        # more records to arrive
+        if self._records.empty():
+            self.flush()
+
+    def flush(self) -> None:
+        """Flush every handler."""
+        for handler in self.handlers:
+            handler.flush()
+
+    def stop(self) -> None:
+        super().stop()
+        self.flush()
+
+
+def _gzip_namer(name: str) -> str:
+    """Name a rotated log file as a gzip file."""
+    return name + ".gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compress a log file being rotated into its gzip backup."""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb", compresslevel=6) as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _compress_backups(handler: logging.handlers.RotatingFileHandler) -> None:
+    """
+    Make a rotating handler gzip the files it rotates out.
+
+    JSON Lines logs typically shrink 5-10x. Only backups are compressed;
+    the live file stays plain text for appending and for the log viewer.
+
+    Args:
+        handler: Handler to configure
+    """
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+
+
+def _attach_queued(logger: logging.Logger, handler: logging.Handler) -> None:
+    """
+    Attach a handler to a logger through a queue drained by a background thread.
+
+    The logging call only enqueues the record; formatting, file writes and
+    rotation happen on the listener thread, so slow disks don't stall
+    LLM calls or command executions. Records queued together are flushed
+    together, and anything still queued is flushed at exit.
+
+    Args:
+        logger: Logger to attach to
+        handler: Handler doing the actual output
+    """
+    records: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    listener = _BatchingQueueListener(records, handler, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    atexit.register(listener.stop)
+    logger.addHandler(logging.handlers.QueueHandler(records))
 
 
 def setup_logging(
@@ -20,6 +168,7 @@ def setup_logging(
     enable_execution_logging: bool = True,
     max_bytes: int = 10_000_000,  # 10MB
     backup_count: int = 5,
+    compress_backups: bool = False,
 ) -> None:
     """
     Configure application-wide logging.
@@ -31,6 +180,7 @@ def setup_logging(
         enable_execution_logging: Enable command execution logging
         max_bytes: Maximum size of each log file before rotation
         backup_count: Number of backup files to keep
+        compress_backups: Gzip rotated log files
     """
     # Create log directory if it doesn't exist
     log_dir.mkdir(exist_ok=True, parents=True)
@@ -59,6 +209,8 @@ def setup_logging(
         log_dir / "app.log", maxBytes=max_bytes, backupCount=backup_count
     )
     app_handler.setLevel(getattr(logging, app_log_level.upper()))
+    if compress_backups:
+        _compress_backups(app_handler)
     app_formatter = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
     )
@@ -67,10 +219,10 @@ def setup_logging(
 
     # Set up specialized loggers
     if enable_llm_logging:
-        setup_llm_logger(log_dir, max_bytes, backup_count)
+        setup_llm_logger(log_dir, max_bytes, backup_count, compress_backups)
 
     if enable_execution_logging:
-        setup_execution_logger(log_dir, max_bytes, backup_count)
+        setup_execution_logger(log_dir, max_bytes, backup_count, compress_backups)
 
     app_logger.info("Logging system initialized")
     app_logger.debug(
@@ -80,50 +232,90 @@ def setup_logging(
 
 
 def setup_llm_logger(
-    log_dir: Path, max_bytes: int = 10_000_000, backup_count: int = 5
+    log_dir: Path,
+    max_bytes: int = 10_000_000,
+    backup_count: int = 5,
+    compress_backups: bool = False,
 ) -> None:
     """
     Set up specialized logger for LLM API calls.
 
     Creates a separate log file for tracking LLM requests and responses
     in JSON Lines format for easy parsing.
+
+    Args:
+        log_dir: Directory to store log files
+        max_bytes: Maximum size of the log file before rotation
+        backup_count: Number of backup files to keep
+        compress_backups: Gzip rotated log files
     """
     llm_logger = logging.getLogger("llm_calls")
     llm_logger.setLevel(logging.DEBUG)
     llm_logger.propagate = False  # Don't propagate to parent
 
     # JSON Lines format handler - append mode for structured logs
-    llm_handler = logging.handlers.RotatingFileHandler(
+    llm_handler = _BatchingRotatingFileHandler(
         log_dir / "llm_calls.jsonl", maxBytes=max_bytes, backupCount=backup_count
     )
     llm_handler.setLevel(logging.DEBUG)
+    if compress_backups:
+        _compress_backups(llm_handler)
 
     # Simple formatter - we'll write JSON directly in the logger
     llm_formatter = logging.Formatter("%(message)s")
     llm_handler.setFormatter(llm_formatter)
-    llm_logger.addHandler(llm_handler)
+    _attach_queued(llm_logger, llm_handler)
 
 
 def setup_execution_logger(
-    log_dir: Path, max_bytes: int = 10_000_000, backup_count: int = 5
+    log_dir: Path,
+    max_bytes: int = 10_000_000,
+    backup_count: int = 5,
+    compress_backups: bool = False,
 ) -> None:
     """
     Set up specialized logger for command execution audit trail.
 
     Creates a separate log file for tracking all ImageMagick command
     executions in JSON Lines format.
+
+    Args:
+        log_dir: Directory to store log files
+        max_bytes: Maximum size of the log file before rotation
+        backup_count: Number of backup files to keep
+        compress_backups: Gzip rotated log files
     """
     exec_logger = logging.getLogger("executions")
     exec_logger.setLevel(logging.DEBUG)
     exec_logger.propagate = False
 
-    exec_handler = logging.handlers.RotatingFileHandler(
+    exec_handler = _BatchingRotatingFileHandler(
         log_dir / "executions.jsonl", maxBytes=max_bytes, backupCount=backup_count
     )
     exec_handler.setLevel(logging.DEBUG)
+    if compress_backups:
+        _compress_backups(exec_handler)
     exec_formatter = logging.Formatter("%(message)s")
     exec_handler.setFormatter(exec_formatter)
-    exec_logger.addHandler(exec_handler)
+    _attach_queued(exec_logger, exec_handler)
+
+
+def log_json(logger: logging.Logger, payload: Dict[str, Any]) -> None:
+    """
+    Write a dict to a JSON Lines logger as a single line.
+
+    Serializes with orjson when it is installed (the ``fast-json`` extra),
+    which writes compact separators, and with the standard library
+    otherwise. Non-ASCII text is written as UTF-8 either way.
+
+    Args:
+        logger: Logger whose handlers write the JSONL file
+        payload: Entry to write
+
+    Raises:
+        TypeError: If the payload isn't JSON serializable
+    """
+    logger.debug(_dumps(payload))
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -0,0 +1,251 @@
+"""Semantic cache for reusing generated commands across paraphrased requests."""
+
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, FrozenSet, List, Optional, Sequence, Tuple
+
+from .executor import CommandExecutor
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Matches file-like tokens (e.g. "photo.jpg", "out/logo.png") in a request
+_FILE_TOKEN_RE = re.compile(r"[\w./-]+\.[a-z0-9]{2,5}\b")
+
+# Matches numbers, percentages and each side of a geometry ("800x600" -> "800", "600")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?%?")
+
+# Parts of a request that must match exactly for a cached command to apply
+RequestKey = Tuple[FrozenSet[str], Tuple[str, ...]]
+
+
+def _request_key(text: str) -> RequestKey:
+    """
+    Extract the files and numbers a request mentions.
+
+    Embeddings barely distinguish "resize a.jpg to 800x600" from "resize
+    a.jpg to 400x300", so a cached command is only reused when both requests
+    name the same files and the same numbers in the same order. Geometries
+    are split into their numbers, so "800x600" and "800 by 600" agree.
+
+    Args:
+        text: The user's request
+
+    Returns:
+        Tuple of (file names, numbers outside file names)
+    """
+    text = text.lower()
+    files = frozenset(_FILE_TOKEN_RE.findall(text))
+    numbers = tuple(_NUMBER_RE.findall(_FILE_TOKEN_RE.sub(" ", text)))
+    return files, numbers
+
+
+def _is_command(text: str) -> bool:
+    """Check that an LLM reply is an ImageMagick command, not a clarification."""
+    parts = text.split(maxsplit=1)
+    return bool(parts) and parts[0] in CommandExecutor.ALLOWED_COMMANDS
+
+
+class SemanticCache:
+    """Cache of ImageMagick commands keyed by sentence embeddings of the request.
+
+    Requests are embedded and compared against every stored request with
+    cosine similarity. A stored command is reused when the best match reaches
+    ``threshold`` and both requests mention the same files and numbers, so
+    "resize a.jpg to 800x600" never answers "resize b.jpg to 800x600" or
+    "resize a.jpg to 400x300". Only replies that are ImageMagick commands are
+    stored. Entries are scoped (e.g. to a provider and ImageMagick binary) and
+    persisted to SQLite so the cache survives restarts.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        threshold: float = 0.9,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        encoder: Optional[Callable[[str], Sequence[float]]] = None,
+        scope: str = "",
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            path: SQLite file for persistence (in-memory only if None)
+            threshold: Minimum cosine similarity for a cache hit
+            model_name: Sentence-transformers model used for embeddings
+            encoder: Optional callable mapping text to an embedding vector,
+                used instead of loading ``model_name``
+            scope: Entries are only shared with caches of the same scope, e.g.
+                ``"openai/magick"`` so commands for ``convert`` or from another
+                provider are never reused
+
+        Raises:
+            ImportError: If numpy (or sentence-transformers, when no encoder
+                is given) is not installed
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError(
+                "Semantic caching requires numpy and sentence-transformers. "
+                "Install them with: pip install 'imagemagick-agent[semantic-cache]'"
+            ) from e
+
+        self._np = np
+        self.threshold = threshold
+        self.model_name = model_name
+        self.scope = scope
+        self.logger = logging.getLogger("imagemagick_agent.semantic_cache")
+
+        if encoder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                raise ImportError(
+                    "Semantic caching requires sentence-transformers. "
+                    "Install it with: pip install 'imagemagick-agent[semantic-cache]'"
+                ) from e
+            model = SentenceTransformer(model_name)
+            encoder = model.encode
+        self._encoder = encoder
+
+        self._lock = threading.Lock()
+        self._prompts: List[str] = []
+        self._commands: List[str] = []
+        self._keys: List[RequestKey] = []
+        self._embeddings: Optional[Any] = None  # (n, dim) matrix of unit vectors
+        self._last_query: Optional[str] = None
+        self._last_embedding: Optional[Any] = None
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_cache ("
+                "id INTEGER PRIMARY KEY, model TEXT, scope TEXT, prompt TEXT, command TEXT, "
+                "embedding BLOB)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(semantic_cache)")}
+            if "scope" not in columns:
+                # Databases from before scoping; their unscoped rows are never loaded
+                self._conn.execute("ALTER TABLE semantic_cache ADD COLUMN scope TEXT")
+            self._conn.commit()
+            self._load(self._conn)
+
+    def _load(self, conn: sqlite3.Connection) -> None:
+        """Load persisted entries for the current embedding model and scope."""
+        rows = conn.execute(
+            "SELECT prompt, command, embedding FROM semantic_cache "
+            "WHERE model = ? AND scope = ? ORDER BY id",
+            (self.model_name, self.scope),
+        ).fetchall()
+        if not rows:
+            return
+
+        np = self._np
+        vectors = []
+        for prompt, command, blob in rows:
+            self._prompts.append(prompt)
+            self._commands.append(command)
+            self._keys.append(_request_key(prompt))
+            vectors.append(np.frombuffer(blob, dtype=np.float32))
+        self._embeddings = np.vstack(vectors)
+        self.logger.debug("Loaded %d semantic cache entries", len(rows))
+
+    def _embed(self, text: str) -> Any:
+        """Embed text as a unit-length float32 vector, memoizing the last query."""
+        if text == self._last_query:
+            return self._last_embedding
+
+        np = self._np
+        vector = np.asarray(self._encoder(text), dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+
+        self._last_query = text
+        self._last_embedding = vector
+        return vector
+
+    def get(self, user_message: str) -> Optional[str]:
+        """
+        Look up a cached command for a request.
+
+        Args:
+            user_message: The user's request
+
+        Returns:
+            Cached command if a similar enough request was seen, None otherwise
+        """
+        with self._lock:
+            if self._embeddings is None:
+                return None
+
+            key = _request_key(user_message)
+            candidates = [i for i, stored in enumerate(self._keys) if stored == key]
+            if not candidates:
+                return None
+
+            query = self._embed(user_message)
+            # Stored vectors are unit length, so the dot product is the cosine similarity
+            sims = self._embeddings[candidates] @ query
+            best_candidate = int(sims.argmax())
+            similarity = float(sims[best_candidate])
+            if similarity < self.threshold:
+                return None
+            best = candidates[best_candidate]
+
+            self.logger.debug(
+                "Semantic cache hit (similarity=%.3f): %r ~ %r",
+                similarity,
+                user_message[:100],
+                self._prompts[best][:100],
+            )
+            return self._commands[best]
+
+    def put(self, user_message: str, command: str) -> None:
+        """
+        Store the command generated for a request.
+
+        Replies that aren't ImageMagick commands (e.g. clarifying questions)
+        are not stored.
+
+        Args:
+            user_message: The user's request
+            command: Command generated by the LLM
+        """
+        if not _is_command(command):
+            return
+
+        with self._lock:
+            np = self._np
+            vector = self._embed(user_message)
+
+            self._prompts.append(user_message)
+            self._commands.append(command)
+            self._keys.append(_request_key(user_message))
+            if self._embeddings is None:
+                self._embeddings = vector[np.newaxis, :]
+            else:
+                self._embeddings = np.vstack([self._embeddings, vector])
+
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT INTO semantic_cache (model, scope, prompt, command, embedding) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.model_name, self.scope, user_message, command, vector.tobytes()),
+                )
+                self._conn.commit()
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
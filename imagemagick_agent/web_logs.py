@@ -8,28 +8,437 @@ Provides a Flask-based dashboard for:
 - Real-time log streaming
 """
 
+import functools
 import json
+import os
+import queue
 import sys
-import time
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Callable, Hashable, Iterator, List, Dict, Optional, Set, Tuple
 
-from flask import Flask, render_template, request, jsonify, Response, send_from_directory
+from flask import Flask, render_template, request, jsonify, Response, send_from_directory, abort
+from flask.json.provider import JSONProvider
 
+from .log_reader import LogReader, _iter_jsonl_bytes, _loads
 
-def create_app(log_dir: Path = Path("logs")) -> Flask:
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Open files block renames on Windows (breaking rotation), which has no pread anyway
+_HAS_PREAD = hasattr(os, "pread")
+
+# Seconds between SSE keepalive comments on an idle stream
+KEEPALIVE_INTERVAL = 15.0
+
+# Waitress worker threads; each open /api/stream connection holds one
+DEFAULT_THREADS = 16
+
+
+def _dumps_bytes(obj: Any) -> bytes:
+    """Serialize an object to UTF-8 JSON, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _sse_batch(entry: Dict[str, Any], subscriber: "queue.SimpleQueue[Dict[str, Any]]") -> bytes:
+    """
+    Encode an entry and everything already queued behind it as SSE frames.
+
+    A burst of log writes then goes out as one chunk, and one socket
+    write, instead of one per entry.
+
+    Args:
+        entry: Entry just taken from the subscriber queue
+        subscriber: Queue to drain without blocking
+
+    Returns:
+        Concatenated ``data:`` frames
+    """
+    buf = bytearray()
+    while True:
+        buf += b"data: "
+        buf += _dumps_bytes(entry)
+        buf += b"\n\n"
+        try:
+            entry = subscriber.get_nowait()
+        except queue.Empty:
+            return bytes(buf)
+
+
+class _ResponseCache:
+    """
+    Bounded LRU cache of response bodies.
+
+    Keys include the logs' ETag, so entries for an older state of the logs
+    are never hit again and simply age out.
+    """
+
+    def __init__(self, maxsize: int = 128, max_body: int = 256 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of cached responses
+            max_body: Largest body, in bytes, worth keeping
+        """
+        self.maxsize = maxsize
+        self.max_body = max_body
+        self._bodies: "OrderedDict[Hashable, Tuple[bytes, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Get the body and mimetype cached for a key, if any."""
+        with self._lock:
+            cached = self._bodies.get(key)
+            if cached is not None:
+                self._bodies.move_to_end(key)
+            return cached
+
+    def put(self, key: Hashable, body: bytes, mimetype: Optional[str]) -> None:
+        """Cache a body, evicting the least recently used one when full."""
+        if len(body) > self.max_body:
+            return
+        with self._lock:
+            self._bodies[key] = (body, mimetype)
+            self._bodies.move_to_end(key)
+            if len(self._bodies) > self.maxsize:
+                self._bodies.popitem(last=False)
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Responses are built straight from the bytes orjson produces, skipping
+    the str round trip of the default provider. Keys keep their insertion
+    order instead of being sorted.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return Response(_dumps_bytes(obj), mimetype="application/json")
+
+
+class LogTailer:
+    """
+    Follow the JSONL log files and fan new entries out to subscribers.
+
+    A single background thread reads lines appended to the log files and
+    puts each parsed entry, tagged with its ``log_type``, on the queue of
+    every subscriber, so the cost of following the files doesn't grow with
+    the number of connected clients. With the optional ``watchdog`` package
+    installed the thread wakes on file system events; otherwise it checks
+    the files every ``poll_interval`` seconds. Where ``os.pread`` exists the
+    files are kept open between reads. A file that is replaced (e.g.
+    rotated) or truncated is followed from its start.
+    """
+
+    def __init__(self, files: Dict[str, Path], poll_interval: float = 0.5):
+        """
+        Initialize the log tailer.
+
+        Args:
+            files: Log file to follow for each log type
+            poll_interval: Seconds between checks when watchdog isn't available
+        """
+        self.files = files
+        self.poll_interval = poll_interval
+        # path -> (inode, offset just past the last line read)
+        self._positions: Dict[Path, Tuple[int, int]] = {}
+        # path -> (inode, descriptor) of files kept open between reads
+        self._fds: Dict[Path, Tuple[int, int]] = {}
+        self._subscribers: Set["queue.SimpleQueue[Dict[str, Any]]"] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer: Any = None
+
+    def subscribe(self) -> "queue.SimpleQueue[Dict[str, Any]]":
+        """
+        Register a subscriber for entries written from now on.
+
+        Returns:
+            Queue receiving new log entries
+        """
+        subscriber: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        with self._lock:
+            if not self._subscribers:
+                # Nobody was listening, so skip what was written in the meantime
+                self._seek_to_end()
+            self._subscribers.add(subscriber)
+            if self._thread is None:
+                self._start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: "queue.SimpleQueue[Dict[str, Any]]") -> None:
+        """
+        Stop delivering entries to a subscriber.
+
+        Args:
+            subscriber: Queue returned by subscribe()
+        """
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def close(self) -> None:
+        """Stop the background thread and file system watcher."""
+        self._stopped.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            for path in list(self._fds):
+                self._close_fd(path)
+
+    def _seek_to_end(self) -> None:
+        """Position every file at its current end."""
+        self._positions.clear()
+        for path in self.files.values():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            self._positions[path] = (st.st_ino, st.st_size)
+
+    def _start(self) -> None:
+        """Start the reader thread, and a file system watcher if available."""
+        timeout = self.poll_interval
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            pass
+        else:
+            names = {path.name for path in self.files.values()}
+            wake = self._wake
+
+            class _Handler(FileSystemEventHandler):
+                def on_any_event(self, event: Any) -> None:
+                    paths = (event.src_path, getattr(event, "dest_path", ""))
+                    if any(os.path.basename(os.fsdecode(p)) in names for p in paths):
+                        wake.set()
+
+            directories = {path.parent for path in self.files.values() if path.parent.is_dir()}
+            if directories:
+                observer = Observer()
+                for directory in directories:
+                    observer.schedule(_Handler(), str(directory))
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+                # Events do the waking; the timeout only guards against missed ones
+                timeout = max(timeout, 5.0)
+
+        self._thread = threading.Thread(
+            target=self._run, args=(timeout,), name="log-tailer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, timeout: float) -> None:
+        """Deliver new entries until closed."""
+        while not self._stopped.is_set():
+            self._wake.wait(timeout)
+            self._wake.clear()
+            with self._lock:
+                if self._subscribers:
+                    self._read_new()
+
+    def _read_new(self) -> None:
+        """Read newly appended lines and hand the entries to every subscriber."""
+        for log_type, path in self.files.items():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                self._positions.pop(path, None)
+                self._close_fd(path)
+                continue
+
+            ino, offset = self._positions.get(path, (st.st_ino, 0))
+            if ino != st.st_ino or st.st_size < offset:
+                # Rotated or truncated: the file now holds only new entries
+                offset = 0
+            elif st.st_size == offset:
+                continue
+
+            if _HAS_PREAD:
+                lines = self._pread_lines(path, st.st_ino, offset, st.st_size)
+            else:
+                lines = _iter_jsonl_bytes(path, offset)
+            for line, offset in lines:
+                try:
+                    entry = _loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+                entry["log_type"] = log_type
+                for subscriber in self._subscribers:
+                    subscriber.put(entry)
+            self._positions[path] = (st.st_ino, offset)
+
+    def _pread_lines(
+        self, path: Path, ino: int, offset: int, size: int
+    ) -> Iterator[Tuple[bytes, int]]:
+        """
+        Read the complete lines between an offset and the file size.
+
+        The file stays open between ticks and is only reopened once its
+        inode changes, so each tick costs one ``pread`` and one C-level split.
+
+        Args:
+            path: File to read
+            ino: Inode the path currently refers to
+            offset: Byte offset to start from (at a line boundary)
+            size: Current file size
+
+        Yields:
+            Tuples of (line without newline, offset just past the line)
+        """
+        opened = self._fds.get(path)
+        if opened is None or opened[0] != ino:
+            self._close_fd(path)
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                return
+            if os.fstat(fd).st_ino != ino:
+                # Replaced since it was stat'ed; the next tick starts it over
+                os.close(fd)
+                return
+            opened = self._fds[path] = (ino, fd)
+        lines = os.pread(opened[1], size - offset, offset).split(b"\n")
+        # The last piece is unfinished (or empty, after a final newline)
+        del lines[-1]
+        for line in lines:
+            offset += len(line) + 1
+            yield line, offset
+
+    def _close_fd(self, path: Path) -> None:
+        """Close the descriptor kept open for a file, if any."""
+        opened = self._fds.pop(path, None)
+        if opened is not None:
+            os.close(opened[1])
+
+
+class StatsRefresher:
+    """
+    Keep a LogReader's parsed logs and stats warm from a background thread.
+
+    Every ``interval`` seconds the thread checks whether the logs changed
+    and, if so, parses the new lines and folds them into the stats. The
+    request path then finds the scan up to date, or at most a few lines
+    behind, instead of paying for everything written since the last query.
+    """
+
+    def __init__(self, reader: LogReader, interval: float = 2.0):
+        """
+        Initialize and start the refresher.
+
+        Args:
+            reader: Reader to keep up to date
+            interval: Seconds between checks
+        """
+        self.reader = reader
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stats-refresher", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread."""
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Refresh whenever the logs changed, until closed."""
+        etag = None
+        while True:
+            current = self.reader.etag()
+            if current != etag:
+                try:
+                    self.reader.refresh()
+                except OSError:
+                    # Try again next time; queries still read the logs themselves
+                    pass
+                else:
+                    etag = current
+            if self._stopped.wait(self.interval):
+                return
+
+
+def create_app(log_dir: Path = Path("logs"), refresh_interval: Optional[float] = 2.0) -> Flask:
     """
     Create and configure the Flask application.
 
     Args:
         log_dir: Directory containing log files
+        refresh_interval: Seconds between background refreshes of the
+            parsed logs and stats, or None to only read them on request
 
     Returns:
         Configured Flask app
     """
     app = Flask(__name__, template_folder="templates")
     app.config["LOG_DIR"] = log_dir
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+    reader = LogReader(log_dir)
+    tailer = LogTailer({"llm": reader.llm_log_file, "execution": reader.exec_log_file})
+    app.extensions["log_tailer"] = tailer
+    if refresh_interval is not None:
+        app.extensions["stats_refresher"] = StatsRefresher(reader, refresh_interval)
+
+    responses = _ResponseCache()
+
+    def etagged(view: Callable[..., Response]) -> Callable[..., Response]:
+        """
+        Answer a log query from cache while the logs are unchanged.
+
+        Every response carries the reader's ETag, so polling clients that
+        send it back in If-None-Match get 304 Not Modified. Other repeats of
+        a query, e.g. from several dashboards, are served the cached body.
+        """
+
+        @functools.wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Response:
+            # Tagged before reading: a write racing the query only makes
+            # the next request miss
+            etag = reader.etag()
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                key = (
+                    request.endpoint,
+                    tuple(sorted(kwargs.items())),
+                    tuple(sorted(request.args.items(multi=True))),
+                    etag,
+                )
+                cached = responses.get(key)
+                if cached is not None:
+                    response = Response(cached[0], mimetype=cached[1])
+                else:
+                    response = view(*args, **kwargs)
+                    if response.status_code == 200 and not response.is_streamed:
+                        responses.put(key, response.get_data(), response.mimetype)
+            response.set_etag(etag)
+            return response
+
+        return wrapper
 
     @app.route("/")
     def index():
@@ -37,6 +446,7 @@ def create_app(log_dir: Path = Path("logs")) -> Flask:
         return render_template("dashboard.html")
 
     @app.route("/api/llm-calls")
+    @etagged
     def get_llm_calls():
         """
         Get LLM call logs with optional filtering.
@@ -48,47 +458,18 @@ def create_app(log_dir: Path = Path("logs")) -> Flask:
             success: Filter by success status (true/false)
             limit: Maximum number of results to return
         """
-        # Parse query params
-        start_time = request.args.get("start")
-        end_time = request.args.get("end")
-        provider = request.args.get("provider")
         success_filter = request.args.get("success")
-        limit = int(request.args.get("limit", 100))
-
-        logs = []
-        llm_log_file = app.config["LOG_DIR"] / "llm_calls.jsonl"
-
-        if llm_log_file.exists():
-            with open(llm_log_file, "r") as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-
-                        # Apply filters
-                        if start_time and log.get("timestamp", "") < start_time:
-                            continue
-                        if end_time and log.get("timestamp", "") > end_time:
-                            continue
-                        if provider and log.get("provider") != provider:
-                            continue
-                        if success_filter is not None:
-                            success_bool = success_filter.lower() == "true"
-                            if log.get("success") != success_bool:
-                                continue
-
-                        logs.append(log)
-
-                        # Apply limit
-                        if len(logs) >= limit:
-                            break
-                    except json.JSONDecodeError:
-                        continue
-
-        # Return most recent first
-        logs.reverse()
+        logs = reader.get_llm_calls(
+            limit=int(request.args.get("limit", 100)),
+            provider=request.args.get("provider"),
+            success=None if success_filter is None else success_filter.lower() == "true",
+            start=request.args.get("start"),
+            end=request.args.get("end"),
+        )
         return jsonify(logs)
 
     @app.route("/api/executions")
+    @etagged
     def get_executions():
         """
         Get command execution logs with optional filtering.
@@ -99,184 +480,93 @@ def create_app(log_dir: Path = Path("logs")) -> Flask:
             success: Filter by success status (true/false)
             limit: Maximum number of results to return
         """
-        start_time = request.args.get("start")
-        end_time = request.args.get("end")
         success_filter = request.args.get("success")
-        limit = int(request.args.get("limit", 100))
+        logs = reader.get_executions(
+            limit=int(request.args.get("limit", 100)),
+            success=None if success_filter is None else success_filter.lower() == "true",
+            start=request.args.get("start"),
+            end=request.args.get("end"),
+        )
+        return jsonify(logs)
 
-        logs = []
-        exec_log_file = app.config["LOG_DIR"] / "executions.jsonl"
+    @app.route("/api/raw/<log_type>")
+    @etagged
+    def get_raw_logs(log_type: str):
+        """
+        Get the newest raw log lines as NDJSON, oldest first.
 
-        if exec_log_file.exists():
-            with open(exec_log_file, "r") as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-
-                        # Apply filters
-                        if start_time and log.get("timestamp", "") < start_time:
-                            continue
-                        if end_time and log.get("timestamp", "") > end_time:
-                            continue
-                        if success_filter is not None:
-                            success_bool = success_filter.lower() == "true"
-                            if log.get("success") != success_bool:
-                                continue
-
-                        logs.append(log)
-
-                        if len(logs) >= limit:
-                            break
-                    except json.JSONDecodeError:
-                        continue
+        The lines are located by scanning the file backwards and sent as
+        they are, without parsing, for clients that decode and format
+        entries themselves.
 
-        logs.reverse()
-        return jsonify(logs)
+        Path parameters:
+            log_type: Log to read (llm or execution)
+
+        Query parameters:
+            lines: Maximum number of lines to return
+        """
+        log_files = {"llm": reader.llm_log_file, "execution": reader.exec_log_file}
+        if log_type not in log_files:
+            abort(404)
+        path = log_files[log_type]
+        lines = int(request.args.get("lines", 100))
+
+        offset, length = reader.tail_bytes(path, lines)
+        data = b""
+        if length:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+        return Response(data, mimetype="application/x-ndjson")
 
     @app.route("/api/stats")
+    @etagged
     def get_stats():
         """
         Get summary statistics for logs.
 
+        Statistics are maintained incrementally by the shared LogReader,
+        which a StatsRefresher keeps up to date in the background, so a
+        request only parses lines appended since the last refresh.
+
         Returns:
             JSON with counts, averages, and other metrics
         """
-        stats = {
-            "llm_calls": {
-                "total": 0,
-                "successful": 0,
-                "failed": 0,
-                "avg_response_time_ms": 0,
-                "total_tokens": {"input": 0, "output": 0},
-            },
-            "executions": {
-                "total": 0,
-                "successful": 0,
-                "failed": 0,
-                "avg_execution_time_ms": 0,
-            },
-        }
-
-        # Process LLM calls
-        llm_log_file = app.config["LOG_DIR"] / "llm_calls.jsonl"
-        if llm_log_file.exists():
-            response_times = []
-            with open(llm_log_file, "r") as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-                        if log.get("event") == "llm_response":
-                            stats["llm_calls"]["total"] += 1
-                            if log.get("success"):
-                                stats["llm_calls"]["successful"] += 1
-                            else:
-                                stats["llm_calls"]["failed"] += 1
-
-                            if "response_time_ms" in log:
-                                response_times.append(log["response_time_ms"])
-
-                            if "token_usage" in log and log["token_usage"]:
-                                stats["llm_calls"]["total_tokens"]["input"] += log[
-                                    "token_usage"
-                                ].get("input_tokens", 0)
-                                stats["llm_calls"]["total_tokens"]["output"] += log[
-                                    "token_usage"
-                                ].get("output_tokens", 0)
-                    except json.JSONDecodeError:
-                        continue
-
-            if response_times:
-                stats["llm_calls"]["avg_response_time_ms"] = round(
-                    sum(response_times) / len(response_times), 2
-                )
-
-        # Process executions
-        exec_log_file = app.config["LOG_DIR"] / "executions.jsonl"
-        if exec_log_file.exists():
-            execution_times = []
-            with open(exec_log_file, "r") as f:
-                for line in f:
-                    try:
-                        log = json.loads(line.strip())
-                        if log.get("event") == "command_execution":
-                            stats["executions"]["total"] += 1
-                            if log.get("success"):
-                                stats["executions"]["successful"] += 1
-                            else:
-                                stats["executions"]["failed"] += 1
-
-                            if "execution_time_ms" in log:
-                                execution_times.append(log["execution_time_ms"])
-                    except json.JSONDecodeError:
-                        continue
-
-            if execution_times:
-                stats["executions"]["avg_execution_time_ms"] = round(
-                    sum(execution_times) / len(execution_times), 2
-                )
-
-        return jsonify(stats)
+        return jsonify(reader.get_stats())
 
     @app.route("/api/stream")
     def stream_logs():
         """
         Server-Sent Events endpoint for live log streaming.
 
-        Streams new log entries as they are written to files.
+        Streams new log entries as they are written to files. All clients
+        share one LogTailer, which reads each new line once.
         """
 
         def generate():
             """Generate SSE stream of new log entries."""
-            # Track last read position for each file
-            llm_log_file = app.config["LOG_DIR"] / "llm_calls.jsonl"
-            exec_log_file = app.config["LOG_DIR"] / "executions.jsonl"
-
-            llm_position = llm_log_file.stat().st_size if llm_log_file.exists() else 0
-            exec_position = exec_log_file.stat().st_size if exec_log_file.exists() else 0
-
-            while True:
-                new_entries = []
-
-                # Check LLM logs
-                if llm_log_file.exists():
-                    current_size = llm_log_file.stat().st_size
-                    if current_size > llm_position:
-                        with open(llm_log_file, "r") as f:
-                            f.seek(llm_position)
-                            for line in f:
-                                try:
-                                    log_entry = json.loads(line.strip())
-                                    log_entry["log_type"] = "llm"
-                                    new_entries.append(log_entry)
-                                except json.JSONDecodeError:
-                                    pass
-                            llm_position = f.tell()
-
-                # Check execution logs
-                if exec_log_file.exists():
-                    current_size = exec_log_file.stat().st_size
-                    if current_size > exec_position:
-                        with open(exec_log_file, "r") as f:
-                            f.seek(exec_position)
-                            for line in f:
-                                try:
-                                    log_entry = json.loads(line.strip())
-                                    log_entry["log_type"] = "execution"
-                                    new_entries.append(log_entry)
-                                except json.JSONDecodeError:
-                                    pass
-                            exec_position = f.tell()
-
-                # Send new entries
-                for entry in new_entries:
-                    yield f"data: {json.dumps(entry)}\n\n"
-
-                # Wait before next check
-                time.sleep(1)
-
-        return Response(generate(), mimetype="text/event-stream")
+            subscriber = tailer.subscribe()
+            try:
+                while True:
+                    try:
+                        entry = subscriber.get(timeout=KEEPALIVE_INTERVAL)
+                    except queue.Empty:
+                        # Comment line keeping proxies from closing an idle stream
+                        yield b": keepalive\n\n"
+                        continue
+                    yield _sse_batch(entry, subscriber)
+            finally:
+                tailer.unsubscribe(subscriber)
+
+        # The generator yields bytes, so Werkzeug can hand them on as they are
+        response = Response(generate(), mimetype="text/event-stream", direct_passthrough=True)
+        # Keep caches and buffering proxies (e.g. nginx) from holding events back
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
 
     @app.route("/api/search")
+    @etagged
     def search_logs():
         """
         Search logs by text content.
@@ -286,63 +576,36 @@ def create_app(log_dir: Path = Path("logs")) -> Flask:
             log_type: Type of log to search (llm, execution, or all)
             limit: Maximum results
         """
-        query = request.args.get("q", "").lower()
+        query = request.args.get("q", "")
         log_type = request.args.get("log_type", "all")
         limit = int(request.args.get("limit", 50))
 
         if not query:
             return jsonify([])
 
-        results = []
-
-        # Search LLM logs
-        if log_type in ["llm", "all"]:
-            llm_log_file = app.config["LOG_DIR"] / "llm_calls.jsonl"
-            if llm_log_file.exists():
-                with open(llm_log_file, "r") as f:
-                    for line in f:
-                        try:
-                            log = json.loads(line.strip())
-                            # Search in relevant fields
-                            searchable = json.dumps(log).lower()
-                            if query in searchable:
-                                log["log_type"] = "llm"
-                                results.append(log)
-                                if len(results) >= limit:
-                                    break
-                        except json.JSONDecodeError:
-                            continue
-
-        # Search execution logs
-        if log_type in ["execution", "all"] and len(results) < limit:
-            exec_log_file = app.config["LOG_DIR"] / "executions.jsonl"
-            if exec_log_file.exists():
-                with open(exec_log_file, "r") as f:
-                    for line in f:
-                        try:
-                            log = json.loads(line.strip())
-                            searchable = json.dumps(log).lower()
-                            if query in searchable:
-                                log["log_type"] = "execution"
-                                results.append(log)
-                                if len(results) >= limit:
-                                    break
-                        except json.JSONDecodeError:
-                            continue
-
-        return jsonify(results)
+        return jsonify(reader.search(query, log_type=log_type, limit=limit))
 
     return app
 
 
-def run_server(log_dir: Path = Path("logs"), port: int = 5000, debug: bool = False):
+def run_server(
+    log_dir: Path = Path("logs"),
+    port: int = 5000,
+    debug: bool = False,
+    threads: int = DEFAULT_THREADS,
+):
     """
     Run the log viewer web server.
 
+    Live streams keep a worker thread for as long as the browser tab is
+    open, so ``threads`` bounds the number of concurrent viewers; a few
+    more are needed for the regular API requests.
+
     Args:
         log_dir: Directory containing log files
         port: Port to run server on
         debug: Enable Flask debug mode (only affects Flask's error pages, uses Waitress regardless)
+        threads: Number of Waitress worker threads
     """
     from waitress import serve
 
@@ -353,7 +616,7 @@ def run_server(log_dir: Path = Path("logs"), port: int = 5000, debug: bool = Fal
 
     try:
         # Use Waitress for production-ready serving with proper signal handling
-        serve(app, host="0.0.0.0", port=port, threads=4, _quiet=False)
+        serve(app, host="0.0.0.0", port=port, threads=threads, _quiet=False)
     except KeyboardInterrupt:
         print("\n\nShutting down log viewer...")
         sys.exit(0)
@@ -0,0 +1,11 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from imagemagick_agent.executor import CommandExecutor
+
+
+@pytest.fixture(scope="session")
+def executor():
+    """Create a CommandExecutor instance, shared since validation doesn't change it."""
+    return CommandExecutor()
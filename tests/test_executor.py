@@ -2,47 +2,42 @@
 
 import pytest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import Mock
 
-from imagemagick_agent.executor import CommandExecutor
-
-
-@pytest.fixture
-def executor():
-    """Create a CommandExecutor instance."""
-    return CommandExecutor()
+from imagemagick_agent.executor import CommandExecutor, _tokenize
 
 
 class TestImageMagickDetection:
     """Test ImageMagick version detection."""
 
-    def test_detect_magick_v7(self):
+    def test_detect_magick_v7(self, monkeypatch):
         """Test detection of ImageMagick 7.x (magick command)."""
-        with patch("shutil.which") as mock_which:
-            mock_which.side_effect = lambda cmd: "/usr/bin/magick" if cmd == "magick" else None
-            executor = CommandExecutor()
-            assert executor.imagemagick_command == "magick"
+        monkeypatch.setattr(
+            "shutil.which", lambda cmd: "/usr/bin/magick" if cmd == "magick" else None
+        )
+        executor = CommandExecutor()
+        assert executor.imagemagick_command == "magick"
 
-    def test_detect_convert_v6(self):
+    def test_detect_convert_v6(self, monkeypatch):
         """Test detection of ImageMagick 6.x (convert command)."""
-        with patch("shutil.which") as mock_which:
-            mock_which.side_effect = lambda cmd: "/usr/bin/convert" if cmd == "convert" else None
-            executor = CommandExecutor()
-            assert executor.imagemagick_command == "convert"
+        monkeypatch.setattr(
+            "shutil.which", lambda cmd: "/usr/bin/convert" if cmd == "convert" else None
+        )
+        executor = CommandExecutor()
+        assert executor.imagemagick_command == "convert"
 
-    def test_prefer_magick_over_convert(self):
+    def test_prefer_magick_over_convert(self, monkeypatch):
         """Test that magick is preferred if both exist."""
-        with patch("shutil.which") as mock_which:
-            # Both commands exist
-            mock_which.return_value = "/usr/bin/something"
-            executor = CommandExecutor()
-            assert executor.imagemagick_command == "magick"
+        # Both commands exist
+        monkeypatch.setattr("shutil.which", lambda cmd: "/usr/bin/something")
+        executor = CommandExecutor()
+        assert executor.imagemagick_command == "magick"
 
-    def test_not_installed_raises_error(self):
+    def test_not_installed_raises_error(self, monkeypatch):
         """Test that missing ImageMagick raises RuntimeError."""
-        with patch("shutil.which", return_value=None):
-            with pytest.raises(RuntimeError, match="ImageMagick is not installed"):
-                CommandExecutor()
+        monkeypatch.setattr("shutil.which", lambda cmd: None)
+        with pytest.raises(RuntimeError, match="ImageMagick is not installed"):
+            CommandExecutor()
 
 
 class TestCommandValidation:
@@ -62,94 +57,150 @@ class TestCommandValidation:
         assert is_valid
         assert error is None
 
+    def test_non_ascii_filenames_are_allowed(self, executor):
+        """Test that non-ASCII filenames aren't mistaken for metacharacters."""
+        assert executor.validate_command("magick 写真.jpg -resize 50% фото.png") == (True, None)
+
     def test_invalid_command(self, executor):
         """Test that invalid commands fail validation."""
         command = "rm -rf /"
         is_valid, error = executor.validate_command(command)
         assert not is_valid
-        assert "not allowed" in error
+        assert error == CommandExecutor.COMMAND_NOT_ALLOWED_ERROR.format(
+            command="rm", allowed=", ".join(CommandExecutor.ALLOWED_COMMANDS)
+        )
 
-    def test_dangerous_shell_metacharacters(self, executor):
-        """Test that shell metacharacters are rejected."""
-        commands = [
+    @pytest.mark.parametrize(
+        "command",
+        [
             "magick input.jpg | cat",
             "magick input.jpg; rm file.txt",
             "magick input.jpg && echo 'test'",
             "magick $(whoami).jpg output.jpg",
-        ]
-        for command in commands:
-            is_valid, error = executor.validate_command(command)
-            assert not is_valid
-            assert "metacharacters" in error.lower()
-
-    def test_dangerous_options(self, executor):
-        """Test that dangerous options are rejected."""
-        command = "magick -script malicious.txt input.jpg output.jpg"
+            "magick `whoami`.jpg output.jpg",
+            "magick фото.jpg; rm file.txt",
+            "magick input.jpg {-write,evil.png} output.jpg",
+            "magick input.jpg {-script,a.txt} output.jpg",
+            "magick input.jpg {-delegate,show} output.jpg",
+            "magick input.jpg {+process,analyze} output.jpg",
+        ],
+    )
+    def test_dangerous_shell_metacharacters(self, executor, command):
+        """Test that shell metacharacters are rejected."""
+        is_valid, error = executor.validate_command(command)
+        assert not is_valid
+        assert error == CommandExecutor.SHELL_METACHARACTERS_ERROR
+
+    @pytest.mark.parametrize(
+        "command,option",
+        [
+            ("magick -script malicious.txt input.jpg output.jpg", "-script"),
+            ("magick input.jpg +write copy.png output.jpg", "-write"),
+            ("magick input.jpg -delegate show output.jpg", "-delegate"),
+            ("magick input.jpg +delegate output.jpg", "-delegate"),
+            ("magick input.jpg -process analyze output.jpg", "-process"),
+            ("magick input.jpg -PROCESS analyze output.jpg", "-process"),
+            ("magick input.jpg -resize 50% '-write' copy.png output.jpg", "-write"),
+            ("magick input.jpg -WRITE copy.png output.jpg", "-write"),
+            ("magick input.jpg -resize 50% -script a.txt -write b.png output.jpg", "-script"),
+            ("magick @files.txt output.jpg", "@"),
+        ],
+    )
+    def test_dangerous_options(self, executor, command, option):
+        """Test that dangerous options are rejected, however they are spelled."""
         is_valid, error = executor.validate_command(command)
         assert not is_valid
-        assert "dangerous" in error.lower()
+        assert error == CommandExecutor.DANGEROUS_OPTION_ERROR.format(option=option)
+
+    def test_option_names_inside_filenames_are_allowed(self, executor):
+        """Test that filenames merely containing an option name pass."""
+        assert executor.validate_command("magick my-script.jpg re-write.png") == (True, None)
+
+    def test_cached_rule_sets_are_immutable(self):
+        """Test that the sets behind cached verdicts can't be changed in place."""
+        with pytest.raises(AttributeError):
+            CommandExecutor.DANGEROUS_OPTIONS.add("-resize")
+        with pytest.raises(AttributeError):
+            CommandExecutor.ALLOWED_COMMANDS.add("rm")
 
     def test_empty_command(self, executor):
         """Test that empty commands are rejected."""
         is_valid, error = executor.validate_command("")
         assert not is_valid
-        assert "empty" in error.lower()
+        assert error == CommandExecutor.EMPTY_COMMAND_ERROR
+
+    def test_repeated_validation_is_cached(self, monkeypatch):
+        """Test that a repeated command reuses the checks but is logged every time."""
+        monkeypatch.setattr("shutil.which", lambda cmd: "/usr/bin/magick")
+        execution_logger = Mock()
+        executor = CommandExecutor(execution_logger=execution_logger)
+        CommandExecutor._check_command.cache_clear()
+
+        results = [executor.validate_command("magick a.jpg | cat") for _ in range(2)]
+
+        assert results == [(False, CommandExecutor.SHELL_METACHARACTERS_ERROR)] * 2
+        assert CommandExecutor._check_command.cache_info().hits == 1
+        assert execution_logger.log_validation.call_count == 2
 
 
 class TestOutputPathSanitization:
     """Test output path sanitization."""
 
-    def test_sanitize_simple_filename(self, executor):
-        """Test that simple filenames are not changed."""
-        command = "magick input.jpg -resize 800x600 output.jpg"
-        sanitized = executor.sanitize_output_path(command)
-        assert sanitized == command
-
-    def test_sanitize_directory_path(self, executor):
-        """Test that directory paths are stripped from output filenames."""
-        command = "magick input.jpg -resize 800x600 outputs/output.jpg"
-        sanitized = executor.sanitize_output_path(command)
-        assert sanitized == "magick input.jpg -resize 800x600 output.jpg"
-
-    def test_sanitize_nested_directory_path(self, executor):
-        """Test that nested directory paths are stripped."""
-        command = "magick input.jpg -blur 0x8 path/to/outputs/blurred.png"
-        sanitized = executor.sanitize_output_path(command)
-        assert sanitized == "magick input.jpg -blur 0x8 blurred.png"
-
-    def test_sanitize_relative_path(self, executor):
-        """Test that relative paths (./) are stripped."""
-        command = "convert input.jpg -rotate 90 ./rotated.jpg"
-        sanitized = executor.sanitize_output_path(command)
-        assert sanitized == "convert input.jpg -rotate 90 rotated.jpg"
-
-    def test_sanitize_parent_directory_path(self, executor):
-        """Test that parent directory paths (../) are stripped."""
-        command = "magick input.jpg -border 10 ../parent/output.png"
-        sanitized = executor.sanitize_output_path(command)
-        assert sanitized == "magick input.jpg -border 10 output.png"
+    @pytest.mark.parametrize(
+        "command,expected",
+        [
+            pytest.param(
+                "magick input.jpg -resize 800x600 output.jpg",
+                "magick input.jpg -resize 800x600 output.jpg",
+                id="simple-filename",
+            ),
+            pytest.param(
+                "magick input.jpg -resize 800x600 outputs/output.jpg",
+                "magick input.jpg -resize 800x600 output.jpg",
+                id="directory",
+            ),
+            pytest.param(
+                "magick input.jpg -blur 0x8 path/to/outputs/blurred.png",
+                "magick input.jpg -blur 0x8 blurred.png",
+                id="nested-directory",
+            ),
+            pytest.param(
+                "convert input.jpg -rotate 90 ./rotated.jpg",
+                "convert input.jpg -rotate 90 rotated.jpg",
+                id="relative",
+            ),
+            pytest.param(
+                "magick input.jpg -border 10 ../parent/output.png",
+                "magick input.jpg -border 10 output.png",
+                id="parent-directory",
+            ),
+            pytest.param(
+                "magick input.jpg -resize 50% out.dir/",
+                "magick input.jpg -resize 50% out.dir",
+                id="trailing-slash",
+            ),
+        ],
+    )
+    def test_sanitize_output_path(self, executor, command, expected):
+        """Test that directory parts are stripped from the output filename."""
+        assert executor.sanitize_output_path(command) == expected
 
 
 class TestOutputFileExtraction:
     """Test output file extraction."""
 
-    def test_extract_simple_output(self, executor):
-        """Test extracting output file from simple command."""
-        command = "magick input.jpg output.png"
-        output = executor.extract_output_file(command)
-        assert output == Path("output.png")
-
-    def test_extract_with_options(self, executor):
-        """Test extracting output file with options."""
-        command = "magick input.jpg -resize 800x600 -quality 90 output.jpg"
-        output = executor.extract_output_file(command)
-        assert output == Path("output.jpg")
-
-    def test_extract_with_directory_path(self, executor):
-        """Test that directory paths are stripped during extraction."""
-        command = "magick input.jpg -resize 800x600 outputs/result.jpg"
-        output = executor.extract_output_file(command)
-        assert output == Path("result.jpg")
+    @pytest.mark.parametrize(
+        "command,expected",
+        [
+            ("magick input.jpg output.png", Path("output.png")),
+            ("magick input.jpg -resize 800x600 -quality 90 output.jpg", Path("output.jpg")),
+            ("magick input.jpg -resize 800x600 outputs/result.jpg", Path("result.jpg")),
+        ],
+        ids=["simple", "with-options", "directory-stripped"],
+    )
+    def test_extract_output(self, executor, command, expected):
+        """Test extracting the output file, without any directory part."""
+        assert executor.extract_output_file(command) == expected
 
     def test_no_output_file(self, executor):
         """Test when no clear output file exists."""
@@ -159,20 +210,37 @@ class TestOutputFileExtraction:
         assert output is None or output == Path("input.jpg")
 
 
+def test_steps_share_tokens(executor):
+    """Test that validating and extracting from a command split it only once."""
+    command = "magick shared-tokens.jpg -resize 50% shared-tokens.png"
+    _tokenize.cache_clear()
+
+    executor.validate_command(command)
+    assert executor.extract_output_file(command) == Path("shared-tokens.png")
+
+    assert _tokenize.cache_info().misses == 1
+
+
 class TestFileOperations:
     """Test file operations."""
 
-    def test_check_existing_file(self, executor):
+    def test_check_existing_file(self, executor, tmp_path):
         """Test checking for an existing file."""
-        # Create a temporary file
-        test_file = Path("test_image.txt")
+        test_file = tmp_path / "test_image.txt"
         test_file.write_text("test")
 
-        try:
-            assert executor.check_file_exists(str(test_file))
-        finally:
-            test_file.unlink()
+        assert executor.check_file_exists(str(test_file))
 
     def test_check_nonexistent_file(self, executor):
         """Test checking for a nonexistent file."""
         assert not executor.check_file_exists("nonexistent_file.jpg")
+
+    def test_check_broken_symlink(self, executor, tmp_path):
+        """Test that a symlink to a missing file doesn't count as existing."""
+        link = tmp_path / "link.jpg"
+        try:
+            link.symlink_to(tmp_path / "missing.jpg")
+        except OSError:
+            pytest.skip("symlinks not supported")
+
+        assert not executor.check_file_exists(str(link))
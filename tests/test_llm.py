@@ -0,0 +1,376 @@
+"""Tests for LLM client helpers."""
+
+import asyncio
+import subprocess
+import sys
+import time
+
+import pytest
+from tenacity import wait_none
+from unittest.mock import Mock, patch
+
+from imagemagick_agent.llm import (
+    DEFAULT_MODELS,
+    RETRY_ATTEMPTS,
+    AnthropicClient,
+    GoogleClient,
+    LLMClient,
+    OpenAIClient,
+    RacingLLMClient,
+    _read_command,
+    _retry_transient,
+    create_llm_client,
+    get_system_prompt,
+)
+from imagemagick_agent.config import LLMProvider, Settings
+
+
+def make_client(command=None, delay=0.0, error=None):
+    """Create a mock LLM client that answers after a delay."""
+
+    def generate(user_message, history, session_id=None):
+        time.sleep(delay)
+        if error:
+            raise error
+        return command
+
+    client = Mock()
+    client.generate_command = Mock(side_effect=generate)
+
+    async def agenerate(user_message, history, session_id=None):
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return command
+
+    client.agenerate_command = agenerate
+    return client
+
+
+class TestSystemPrompt:
+    """Test system prompt generation."""
+
+    def test_prompt_uses_command(self):
+        """Test that the prompt references the detected ImageMagick command."""
+        assert "'convert' CLI tool" in get_system_prompt("convert")
+        assert "'magick' CLI tool" in get_system_prompt("magick")
+
+    def test_prompt_is_cached(self):
+        """Test that repeated calls return the same prompt object."""
+        assert get_system_prompt("magick") is get_system_prompt("magick")
+
+
+class TestReadCommand:
+    """Test reading streamed responses."""
+
+    def test_stops_after_command_line(self):
+        """Test that streaming stops once the command line is complete."""
+        chunks = iter(["magick input.jpg ", "-resize 50% out.jpg", "\nThis resizes", " the image."])
+
+        assert _read_command(chunks) == ("magick input.jpg -resize 50% out.jpg", True)
+        assert next(chunks) == " the image."
+
+    def test_reads_continued_command(self):
+        """Test that a command continued with a trailing backslash is read in full."""
+        chunks = iter(
+            ["magick input.jpg \\\n", "  -resize 50% \\", "\n  out.jpg\n", "This resizes"]
+        )
+
+        assert _read_command(chunks) == ("magick input.jpg -resize 50% out.jpg", True)
+        assert next(chunks) == "This resizes"
+
+    def test_continued_command_at_end_of_stream(self):
+        """Test that a continued command is joined when the stream ends mid-line."""
+        assert _read_command(["convert a.jpg \\\n", "  b.png"]) == ("convert a.jpg b.png", False)
+
+    def test_reads_full_clarification(self):
+        """Test that non-command replies are read to the end."""
+        chunks = ["Which file", " do you mean?\n", "- input.jpg\n", "- logo.png"]
+
+        assert _read_command(chunks) == ("Which file do you mean?\n- input.jpg\n- logo.png", False)
+
+    def test_single_line_without_newline(self):
+        """Test a reply that ends without a trailing newline."""
+        assert _read_command(["\n", "convert a.jpg b.png"]) == ("convert a.jpg b.png", False)
+
+
+class TestRetryTransient:
+    """Test retrying of transient provider errors."""
+
+    def make_call(self, side_effect):
+        """Wrap a mock in the retry decorator without backoff delays."""
+        call = Mock(side_effect=side_effect)
+        wrapped = _retry_transient((ConnectionError,))(call)
+        wrapped.retry.wait = wait_none()
+        return call, wrapped
+
+    def test_transient_error_is_retried(self):
+        """Test that a transient error is retried until the call succeeds."""
+        call, wrapped = self.make_call([ConnectionError(), ConnectionError(), "ok"])
+
+        assert wrapped() == "ok"
+        assert call.call_count == 3
+
+    def test_gives_up_after_max_attempts(self):
+        """Test that the last transient error is raised once attempts run out."""
+        call, wrapped = self.make_call(ConnectionError("down"))
+
+        with pytest.raises(ConnectionError, match="down"):
+            wrapped()
+        assert call.call_count == RETRY_ATTEMPTS
+
+    def test_other_errors_are_not_retried(self):
+        """Test that non-transient errors are raised immediately."""
+        call, wrapped = self.make_call(ValueError("bad request"))
+
+        with pytest.raises(ValueError):
+            wrapped()
+        assert call.call_count == 1
+
+
+class TestRacingLLMClient:
+    """Test racing requests across providers."""
+
+    def test_fastest_client_wins(self):
+        """Test that the first answer is returned."""
+        client = RacingLLMClient(
+            [make_client("magick slow.jpg out.jpg", delay=0.5), make_client("magick fast.jpg out.jpg")]
+        )
+
+        assert client.generate_command("test", []) == "magick fast.jpg out.jpg"
+
+    def test_failed_client_is_skipped(self):
+        """Test that a fast failure does not win the race."""
+        client = RacingLLMClient(
+            [make_client(error=RuntimeError("boom")), make_client("magick a.jpg b.jpg", delay=0.05)]
+        )
+
+        assert client.generate_command("test", []) == "magick a.jpg b.jpg"
+
+    def test_all_clients_fail(self):
+        """Test that an error is raised when every provider fails."""
+        client = RacingLLMClient(
+            [make_client(error=RuntimeError("boom")), make_client(error=RuntimeError("boom"))]
+        )
+
+        with pytest.raises(RuntimeError, match="boom"):
+            client.generate_command("test", [])
+
+    def test_async_fastest_client_wins(self):
+        """Test that the async race returns the first successful answer."""
+        client = RacingLLMClient(
+            [
+                make_client("magick slow.jpg out.jpg", delay=0.5),
+                make_client(error=RuntimeError("boom")),
+                make_client("magick fast.jpg out.jpg", delay=0.05),
+            ]
+        )
+
+        result = asyncio.run(client.agenerate_command("test", []))
+        assert result == "magick fast.jpg out.jpg"
+
+
+class FakeMessageStream:
+    """Stand-in for the context manager returned by Anthropic's messages.stream."""
+
+    def __init__(self, chunks, usage):
+        self.text_stream = iter(chunks)
+        self.current_message_snapshot = Mock(usage=usage)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class TestAnthropicClient:
+    """Test Claude streaming and usage logging."""
+
+    @pytest.fixture
+    def llm_logger(self):
+        """Create a mock LLM call logger."""
+        return Mock()
+
+    @pytest.fixture
+    def client(self, llm_logger):
+        """Create a Claude client with the SDK mocked out."""
+        with patch("anthropic.Anthropic"):
+            return AnthropicClient(
+                api_key="test-key",
+                model="claude-3-5-sonnet-20241022",
+                system_prompt="test",
+                llm_logger=llm_logger,
+            )
+
+    def usage(self):
+        """Create a usage snapshot as Anthropic reports it."""
+        return Mock(
+            input_tokens=1200,
+            output_tokens=7,
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=1100,
+        )
+
+    def logged_usage(self, llm_logger):
+        """Get the token usage passed to the logger."""
+        return llm_logger.log_response.call_args.kwargs["token_usage"]
+
+    def test_complete_stream_logs_output_tokens(self, client, llm_logger):
+        """Test that a stream read to the end logs its final output count."""
+        client.client.messages.stream.return_value = FakeMessageStream(
+            ["magick a.jpg ", "b.png"], self.usage()
+        )
+
+        assert client.generate_command("convert a.jpg", []) == "magick a.jpg b.png"
+        assert self.logged_usage(llm_logger)["output_tokens"] == 7
+
+    def test_early_stop_omits_output_tokens(self, client, llm_logger):
+        """Test that a stream closed after the command line logs no partial output count."""
+        client.client.messages.stream.return_value = FakeMessageStream(
+            ["magick a.jpg b.png\n", "This converts"], self.usage()
+        )
+
+        assert client.generate_command("convert a.jpg", []) == "magick a.jpg b.png"
+        token_usage = self.logged_usage(llm_logger)
+        assert "output_tokens" not in token_usage
+        assert token_usage["input_tokens"] == 1200
+
+    def test_system_prompt_is_cached(self, client, llm_logger):
+        """Test that the system prompt is sent as a cacheable block and cache counts logged."""
+        client.client.messages.stream.return_value = FakeMessageStream(
+            ["magick a.jpg b.png"], self.usage()
+        )
+
+        client.generate_command("convert a.jpg", [])
+
+        system = client.client.messages.stream.call_args.kwargs["system"]
+        assert system == [
+            {"type": "text", "text": "test", "cache_control": {"type": "ephemeral"}}
+        ]
+        token_usage = self.logged_usage(llm_logger)
+        assert token_usage["cache_creation_input_tokens"] == 0
+        assert token_usage["cache_read_input_tokens"] == 1100
+
+
+class TestGoogleClient:
+    """Test Gemini chat session handling."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a Gemini client with the SDK mocked out."""
+        with patch("google.generativeai.configure"), patch(
+            "google.generativeai.GenerativeModel"
+        ) as mock_model:
+            mock_model.return_value.start_chat.side_effect = lambda history: Mock()
+            yield GoogleClient(api_key="test-key", model="gemini-1.5-flash", system_prompt="test")
+
+    def test_chat_reused_within_session(self, client):
+        """Test that follow-up turns reuse the session's chat."""
+        history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+        first = client._get_chat([], "session-a")
+
+        assert client._get_chat(history, "session-a") is first
+        assert client._get_chat(history, "session-b") is not first
+
+    def test_empty_history_starts_new_chat(self, client):
+        """Test that a reset conversation gets a fresh chat."""
+        first = client._get_chat([], "session-a")
+
+        assert client._get_chat([], "session-a") is not first
+
+    def test_chats_not_kept_when_disabled(self, client):
+        """Test that a racing client starts every request from the given history."""
+        client.keep_chats = False
+        history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+        first = client._get_chat(history, "session-a")
+
+        assert client._get_chat(history, "session-a") is not first
+        assert not client._chats
+
+
+class EchoClient(LLMClient):
+    """LLM client that turns each request into a command and records calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_command(self, user_message, history, session_id=None):
+        self.calls.append(user_message)
+        return f"magick {user_message}.jpg out.jpg"
+
+
+class TestBatchGeneration:
+    """Test batch command generation."""
+
+    def test_results_in_prompt_order(self):
+        """Test that commands are returned in the order of the prompts."""
+        client = EchoClient()
+        prompts = [f"img{i}" for i in range(20)]
+
+        commands = client.generate_commands(prompts, concurrency=4)
+
+        assert commands == [f"magick img{i}.jpg out.jpg" for i in range(20)]
+
+    def test_checkpoint_skips_finished_prompts(self, tmp_path):
+        """Test that a rerun only sends prompts missing from the checkpoint."""
+        checkpoint = tmp_path / "batch.jsonl"
+        EchoClient().generate_commands(["a", "b"], checkpoint_path=checkpoint)
+
+        client = EchoClient()
+        commands = client.generate_commands(["a", "b", "c"], checkpoint_path=checkpoint)
+
+        assert commands == ["magick a.jpg out.jpg", "magick b.jpg out.jpg", "magick c.jpg out.jpg"]
+        assert client.calls == ["c"]
+        assert len(checkpoint.read_text().splitlines()) == 3
+
+
+class TestCreateLLMClient:
+    """Test provider dispatch in create_llm_client."""
+
+    def test_creates_configured_provider(self):
+        """Test that the client for the configured provider is created."""
+        settings = Settings(
+            llm_provider=LLMProvider.OPENAI, openai_api_key="test-key", llm_model="gpt-4o"
+        )
+        client = create_llm_client(settings)
+
+        assert isinstance(client, OpenAIClient)
+        assert client.model == "gpt-4o"
+
+    def test_race_uses_per_provider_models(self):
+        """Test that racing takes each provider's model from settings or its default."""
+        settings = Settings(
+            llm_provider=LLMProvider.RACE,
+            anthropic_api_key=None,
+            openai_api_key="test-key",
+            google_api_key="test-key",
+            openai_model="gpt-4o",
+        )
+        with patch("imagemagick_agent.llm.GoogleClient") as google_client:
+            client = create_llm_client(settings)
+
+        assert isinstance(client, RacingLLMClient)
+        assert client.clients[0].model == "gpt-4o"
+        assert google_client.call_args.args[1] == DEFAULT_MODELS[LLMProvider.GOOGLE]
+        assert google_client.call_args.kwargs["keep_chats"] is False
+
+    def test_only_configured_sdk_is_imported(self):
+        """Test that creating one provider's client doesn't import the other SDKs."""
+        code = (
+            "import sys\n"
+            "from imagemagick_agent.config import LLMProvider, Settings\n"
+            "from imagemagick_agent.llm import create_llm_client\n"
+            "create_llm_client(Settings(llm_provider=LLMProvider.OPENAI, openai_api_key='k'))\n"
+            "assert 'openai' in sys.modules\n"
+            "assert 'anthropic' not in sys.modules\n"
+            "assert 'google.generativeai' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_unsupported_provider(self):
+        """Test that an unknown provider raises ValueError."""
+        settings = Mock(llm_provider="unknown")
+
+        with pytest.raises(ValueError, match="Unsupported LLM provider"):
+            create_llm_client(settings)
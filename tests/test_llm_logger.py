@@ -0,0 +1,91 @@
+"""Tests for LLM call logging."""
+
+import json
+import threading
+
+import pytest
+from unittest.mock import patch
+
+from imagemagick_agent.llm_logger import BackgroundLLMCallLogger
+
+
+class TestBackgroundLLMCallLogger:
+    """Test writing LLM call logs on a background thread."""
+
+    @pytest.fixture
+    def written(self):
+        """Capture entries as they are serialized by the logger's thread."""
+        entries = []
+        with patch(
+            "imagemagick_agent.llm_logger.log_json",
+            side_effect=lambda logger, data: entries.append(json.loads(json.dumps(data))),
+        ):
+            yield entries
+
+    def log_call(self, llm_logger, history):
+        """Log a request and its response."""
+        request_id = llm_logger.log_request(
+            provider="openai",
+            model="gpt-4o",
+            user_input="resize a.jpg",
+            conversation_history=history,
+            system_prompt="test",
+        )
+        llm_logger.log_response(
+            request_id=request_id,
+            generated_command="magick a.jpg -resize 50% b.jpg",
+            response_time_ms=12.3,
+        )
+        return request_id
+
+    def test_flush_writes_entries_in_order(self, written):
+        """Test that flush() returns once queued entries are written in order."""
+        llm_logger = BackgroundLLMCallLogger()
+
+        request_id = self.log_call(llm_logger, [])
+        llm_logger.flush()
+
+        assert [(entry["event"], entry["request_id"]) for entry in written] == [
+            ("llm_request", request_id),
+            ("llm_response", request_id),
+        ]
+
+    def test_history_is_snapshotted(self):
+        """Test that changing the history after log_request doesn't change the entry."""
+        release = threading.Event()
+        entries = []
+
+        def slow_log_json(logger, data):
+            release.wait(timeout=5)
+            entries.append(json.loads(json.dumps(data)))
+
+        llm_logger = BackgroundLLMCallLogger()
+        history = [{"role": "user", "content": "hi"}]
+        with patch("imagemagick_agent.llm_logger.log_json", side_effect=slow_log_json):
+            self.log_call(llm_logger, history)
+            history.append({"role": "assistant", "content": "hello"})
+            release.set()
+            llm_logger.flush()
+
+        assert entries[0]["conversation_history"] == [{"role": "user", "content": "hi"}]
+        assert entries[0]["conversation_length"] == 1
+
+    def test_write_failure_keeps_worker_running(self, written):
+        """Test that a failing entry is skipped and later entries are still written."""
+        llm_logger = BackgroundLLMCallLogger()
+        failures = iter([RuntimeError("disk full")])
+
+        def failing_log_json(logger, data):
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            written.append(data)
+
+        with patch("imagemagick_agent.llm_logger.log_json", side_effect=failing_log_json):
+            request_id = self.log_call(llm_logger, [])
+            llm_logger.flush()
+
+        assert llm_logger._thread.is_alive()
+        assert [(entry["event"], entry["request_id"]) for entry in written] == [
+            ("llm_response", request_id)
+        ]
@@ -0,0 +1,488 @@
+"""Tests for log reading."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from imagemagick_agent.log_reader import (
+    LogReader,
+    _entry_predicate,
+    _fast_time,
+    _iter_jsonl_bytes,
+    _iter_lines_reverse,
+)
+
+
+def write_jsonl(path, entries):
+    """Write log entries as JSON lines."""
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+@pytest.fixture
+def reader(tmp_path):
+    """Create a log reader over an empty log directory."""
+    return LogReader(log_dir=tmp_path)
+
+
+class TestLogReader:
+    """Test log reading and filtering."""
+
+    def test_missing_files(self, reader):
+        """Test that missing log files read as empty."""
+        assert reader.get_llm_calls() == []
+        assert reader.get_executions() == []
+        assert reader.get_sessions() == []
+        assert reader.get_stats()["llm_calls"]["total"] == 0
+        assert reader.get_counts_fast()["executions"]["total"] == 0
+
+    def test_malformed_lines_are_skipped(self, reader):
+        """Test that unparseable lines don't break reading."""
+        write_jsonl(reader.llm_log_file, [{"event": "llm_request", "provider": "openai"}])
+        with open(reader.llm_log_file, "ab") as f:
+            f.write(b"{not json\n\xff\xfe\n")
+        write_jsonl(reader.llm_log_file, [{"event": "llm_request", "provider": "google"}])
+
+        logs = reader.get_llm_calls()
+
+        assert [log["provider"] for log in logs] == ["google", "openai"]
+
+    def test_non_ascii_content(self, reader):
+        """Test that non-ASCII text round-trips."""
+        command = "magick ñandú.jpg 出力.png"
+        write_jsonl(reader.exec_log_file, [{"event": "command_execution", "command": command}])
+
+        assert reader.get_executions()[0]["command"] == command
+
+
+class TestParsedCache:
+    """Test incremental parsing of growing log files."""
+
+    def test_appended_lines_are_picked_up(self, reader):
+        """Test that entries appended after a read show up in the next read."""
+        write_jsonl(reader.exec_log_file, [{"event": "command_execution", "success": True}])
+        assert reader.get_stats()["executions"]["total"] == 1
+
+        write_jsonl(reader.exec_log_file, [{"event": "command_execution", "success": False}])
+        stats = reader.get_stats()["executions"]
+
+        assert stats["total"] == 2
+        assert stats["failed"] == 1
+
+    def test_partial_line_is_read_once_complete(self, reader):
+        """Test that a line still being written is parsed after it is finished."""
+        with open(reader.llm_log_file, "wb") as f:
+            f.write(b'{"event": "llm_request", "provider": "openai"}\n{"event": "llm_req')
+        assert len(reader.get_llm_calls()) == 1
+
+        with open(reader.llm_log_file, "ab") as f:
+            f.write(b'uest", "provider": "google"}\n')
+
+        assert [log["provider"] for log in reader.get_llm_calls()] == ["google", "openai"]
+
+    def test_rewritten_file_is_reparsed(self, reader):
+        """Test that a truncated or replaced file is parsed from the start."""
+        write_jsonl(reader.llm_log_file, [{"event": "llm_request", "provider": "openai"}] * 3)
+        assert len(reader.get_llm_calls()) == 3
+
+        reader.llm_log_file.unlink()
+        write_jsonl(reader.llm_log_file, [{"event": "llm_request", "provider": "google"}])
+
+        assert [log["provider"] for log in reader.get_llm_calls()] == ["google"]
+
+    def test_session_index_follows_appends(self, reader):
+        """Test that session-filtered reads of a cached file include new entries."""
+        write_jsonl(
+            reader.exec_log_file,
+            [
+                {"event": "command_execution", "session_id": "s1", "command": "a"},
+                {"event": "command_execution", "session_id": "s2", "command": "b"},
+            ],
+        )
+        reader.get_stats()
+        write_jsonl(
+            reader.exec_log_file,
+            [{"event": "command_execution", "session_id": "s1", "command": "c"}],
+        )
+
+        assert [log["command"] for log in reader.get_executions(session_id="s1")] == ["c", "a"]
+        assert reader.get_executions(session_id="missing") == []
+
+    def test_concurrent_readers(self, reader):
+        """Test that readers on several threads see a consistent cache."""
+        write_jsonl(reader.llm_log_file, [{"event": "llm_response", "success": True}] * 500)
+        write_jsonl(reader.exec_log_file, [{"event": "command_execution", "success": True}] * 500)
+
+        def read(i):
+            if i % 2:
+                return reader.get_stats()["llm_calls"]["total"]
+            return reader.get_stats()["executions"]["total"]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert set(pool.map(read, range(32))) == {500}
+
+    def test_unified_logs_leave_cache_untouched(self, reader):
+        """Test that tagging entries with log_type doesn't leak into other readers."""
+        write_jsonl(reader.llm_log_file, [{"event": "llm_request", "session_id": "s1"}])
+
+        assert reader.get_unified_logs()[0]["log_type"] == "llm"
+        assert "log_type" not in reader.get_llm_calls()[0]
+
+
+class TestRecentEntries:
+    """Test that limited reads return the newest entries."""
+
+    @pytest.mark.parametrize("warm_cache", [False, True])
+    def test_limit_keeps_most_recent(self, reader, warm_cache):
+        """Test that the last entries are returned, newest first."""
+        entries = [{"event": "command_execution", "command": f"cmd {i}"} for i in range(5000)]
+        write_jsonl(reader.exec_log_file, entries)
+        if warm_cache:
+            reader.get_stats()
+
+        logs = reader.get_executions(limit=3)
+
+        assert [log["command"] for log in logs] == ["cmd 4999", "cmd 4998", "cmd 4997"]
+
+    @pytest.mark.parametrize("warm_cache", [False, True])
+    @pytest.mark.parametrize("ordered", [False, True])
+    def test_time_range(self, reader, warm_cache, ordered):
+        """Test filtering by time range, with and without sorted timestamps."""
+        seconds = list(range(10)) if ordered else [0, 1, 2, 3, 4, 9, 5, 6, 7, 8]
+        write_jsonl(
+            reader.llm_log_file,
+            [{"event": "llm_request", "timestamp": f"2024-01-01T10:00:0{s}"} for s in seconds],
+        )
+        if warm_cache:
+            reader.get_stats()
+
+        logs = reader.get_llm_calls(start="2024-01-01T10:00:03", end="2024-01-01T10:00:06")
+
+        assert sorted(log["timestamp"][-1] for log in logs) == ["3", "4", "5", "6"]
+
+    def test_lines_spanning_blocks(self, tmp_path):
+        """Test that reverse reading reassembles lines split across blocks."""
+        path = tmp_path / "lines.txt"
+        lines = [("x" * (i * 37 % 200)).encode() + str(i).encode() for i in range(3000)]
+        path.write_bytes(b"\n".join(lines) + b"\n")
+
+        assert list(_iter_lines_reverse(path)) == lines[::-1]
+
+    @pytest.mark.parametrize("mapped", [False, True])
+    def test_forward_lines_with_offsets(self, tmp_path, monkeypatch, mapped):
+        """Test forward reading from an offset, leaving an unfinished line out."""
+        if mapped:
+            monkeypatch.setattr("imagemagick_agent.log_reader._BULK_READ_LIMIT", 0)
+        path = tmp_path / "lines.txt"
+        path.write_bytes(b"one\ntwo\n\nthree\npart")
+
+        assert list(_iter_jsonl_bytes(path)) == [
+            (b"one", 4),
+            (b"two", 8),
+            (b"", 9),
+            (b"three", 15),
+        ]
+        assert list(_iter_jsonl_bytes(path, 8)) == [(b"", 9), (b"three", 15)]
+        assert list(_iter_jsonl_bytes(path, 15)) == []
+
+    @pytest.mark.parametrize(
+        "n_lines,expected",
+        [
+            (0, b""),
+            (1, b"three\n"),
+            (2, b"\nthree\n"),
+            (4, b"one\ntwo\n\nthree\n"),
+            (9, b"one\ntwo\n\nthree\n"),
+        ],
+    )
+    def test_tail_bytes(self, reader, n_lines, expected):
+        """Test locating the last complete lines, leaving an unfinished line out."""
+        data = b"one\ntwo\n\nthree\npart"
+        reader.llm_log_file.write_bytes(data)
+
+        offset, length = reader.tail_bytes(reader.llm_log_file, n_lines)
+
+        assert data[offset : offset + length] == expected
+
+    def test_tail_bytes_spanning_blocks(self, reader):
+        """Test that the scan continues into earlier blocks."""
+        write_jsonl(reader.exec_log_file, [{"command": "x" * 100, "i": i} for i in range(2000)])
+        data = reader.exec_log_file.read_bytes()
+
+        offset, length = reader.tail_bytes(reader.exec_log_file, 1500)
+
+        assert data[offset : offset + length] == b"".join(data.splitlines(True)[-1500:])
+
+
+class TestScan:
+    """Test stats, sessions and unified logs derived from one scan."""
+
+    @pytest.fixture
+    def populated(self, reader):
+        """Write a small two-session log history."""
+        write_jsonl(
+            reader.llm_log_file,
+            [
+                {"event": "llm_request", "timestamp": "2024-01-01T10:00:00", "session_id": "s1"},
+                {
+                    "event": "llm_response",
+                    "timestamp": "2024-01-01T10:00:01",
+                    "session_id": "s1",
+                    "success": True,
+                    "response_time_ms": 100.0,
+                    "token_usage": {"input_tokens": 10, "output_tokens": 5},
+                },
+            ],
+        )
+        write_jsonl(
+            reader.exec_log_file,
+            [
+                {
+                    "event": "command_execution",
+                    "timestamp": "2024-01-01T10:00:02",
+                    "session_id": "s1",
+                    "success": True,
+                    "execution_time_ms": 50.0,
+                },
+                {
+                    "event": "user_feedback",
+                    "timestamp": "2024-01-01T10:00:03",
+                    "session_id": "s1",
+                    "feedback": "liked",
+                },
+                {
+                    "event": "command_execution",
+                    "timestamp": "2024-01-02T09:00:00",
+                    "session_id": "s2",
+                    "success": False,
+                    "execution_time_ms": 150.0,
+                },
+            ],
+        )
+        return reader
+
+    def test_stats(self, populated):
+        """Test aggregated statistics."""
+        stats = populated.get_stats()
+
+        assert stats["llm_calls"]["total"] == 1
+        assert stats["llm_calls"]["avg_response_time_ms"] == 100.0
+        assert stats["llm_calls"]["total_tokens"] == {"input": 10, "output": 5}
+        assert stats["executions"]["total"] == 2
+        assert stats["executions"]["failed"] == 1
+        assert stats["executions"]["avg_execution_time_ms"] == 100.0
+        assert stats["feedback"]["liked"] == 1
+
+    def test_counts_fast_match_stats(self, populated):
+        """Test that counting raw patterns agrees with the parsed stats."""
+        stats = populated.get_stats()
+        counts = populated.get_counts_fast()
+
+        for name in ("llm_calls", "executions"):
+            assert counts[name] == {
+                key: stats[name][key] for key in ("total", "successful", "failed")
+            }
+
+    def test_sessions(self, populated):
+        """Test session summaries, most recent first."""
+        sessions = populated.get_sessions()
+
+        assert [s["session_id"] for s in sessions] == ["s2", "s1"]
+        assert sessions[1]["command_count"] == 1
+        assert sessions[1]["last_activity"] == "2024-01-01T10:00:03"
+
+    def test_sessions_limit(self, populated):
+        """Test that a limit keeps only the most recent sessions."""
+        assert [s["session_id"] for s in populated.get_sessions(limit=1)] == ["s2"]
+
+    def test_unified_logs(self, populated):
+        """Test the merged timeline, newest first and filterable by session."""
+        logs = populated.get_unified_logs(session_id="s1", limit=3)
+
+        assert [log["event"] for log in logs] == [
+            "user_feedback",
+            "command_execution",
+            "llm_response",
+        ]
+        assert [log["log_type"] for log in logs] == ["execution", "execution", "llm"]
+
+    def test_unified_logs_interleave_files(self, populated):
+        """Test that entries from both files are merged by timestamp."""
+        logs = populated.get_unified_logs(limit=4)
+
+        assert [log["timestamp"] for log in logs] == [
+            "2024-01-02T09:00:00",
+            "2024-01-01T10:00:03",
+            "2024-01-01T10:00:02",
+            "2024-01-01T10:00:01",
+        ]
+
+    def test_unchanged_logs_reuse_scan(self, populated):
+        """Test that the scan is only redone after a log file changes."""
+        scan = populated._scan_all()
+        assert populated._scan_all() is scan
+
+        write_jsonl(populated.exec_log_file, [{"event": "command_execution", "success": True}])
+
+        assert populated._scan_all() is not scan
+        assert populated.get_stats()["executions"]["total"] == 3
+
+    def test_appended_entries_are_folded_in(self, populated):
+        """Test that appends update the totals without changing the previous result."""
+        scan = populated._scan_all()
+        write_jsonl(
+            populated.exec_log_file,
+            [
+                {
+                    "event": "command_execution",
+                    "timestamp": "2024-01-02T09:00:05",
+                    "session_id": "s2",
+                    "success": True,
+                    "execution_time_ms": 250.0,
+                }
+            ],
+        )
+
+        stats = populated.get_stats()["executions"]
+        sessions = populated.get_sessions()
+
+        assert (stats["total"], stats["failed"], stats["avg_execution_time_ms"]) == (3, 1, 150.0)
+        assert sessions[0]["command_count"] == 2
+        assert sessions[0]["last_activity"] == "2024-01-02T09:00:05"
+        assert scan.sessions["s2"]["command_count"] == 1
+        assert scan.stats["executions"]["total"] == 2
+
+    def test_results_are_copies(self, populated):
+        """Test that modifying returned data doesn't change later results."""
+        populated.get_stats()["llm_calls"]["total"] = 99
+        populated.get_sessions()[0]["command_count"] = 99
+
+        assert populated.get_stats()["llm_calls"]["total"] == 1
+        assert populated.get_sessions()[0]["command_count"] == 1
+
+
+class TestPrefilter:
+    """Test filtering on raw lines before parsing."""
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_filters_match_both_separator_styles(self, reader, compact):
+        """Test that filtered reads find entries written with either separator style."""
+        separators = (",", ":") if compact else (", ", ": ")
+        with open(reader.llm_log_file, "w", encoding="utf-8") as f:
+            for provider, session in [("openai", "s1"), ("google", "s1"), ("openai", "s2")]:
+                entry = {"event": "llm_request", "provider": provider, "session_id": session}
+                f.write(json.dumps(entry, separators=separators) + "\n")
+
+        logs = reader.get_llm_calls(provider="openai", session_id="s1")
+
+        assert [(log["provider"], log["session_id"]) for log in logs] == [("openai", "s1")]
+
+    @pytest.mark.parametrize("success", [True, False])
+    def test_success_filter(self, reader, success):
+        """Test filtering on a boolean field."""
+        write_jsonl(
+            reader.exec_log_file,
+            [
+                {"event": "command_execution", "success": True, "command": "ok"},
+                {"event": "command_execution", "success": False, "command": "failed"},
+                {"event": "command_validation", "command": "success: true"},
+            ],
+        )
+
+        logs = reader.get_executions(success=success)
+
+        assert [log["command"] for log in logs] == ["ok" if success else "failed"]
+
+    def test_value_under_other_key_is_rechecked(self, reader):
+        """Test that a needle hit in another field doesn't produce a false match."""
+        write_jsonl(
+            reader.llm_log_file,
+            [
+                {"event": "llm_request", "provider": "google", "meta": {"provider": "openai"}},
+                {"event": "llm_request", "provider": "openai"},
+            ],
+        )
+
+        assert len(reader.get_llm_calls(provider="openai")) == 1
+
+    @pytest.mark.parametrize("query", ["RÉSUMÉ", "résumé", "Crop"])
+    def test_search_ignores_case(self, reader, query):
+        """Test that search matches raw lines case-insensitively, including non-ASCII text."""
+        write_jsonl(
+            reader.exec_log_file,
+            [
+                {"event": "command_execution", "command": "magick résumé.png -crop 10x10 out.png"},
+                {"event": "command_execution", "command": "magick a.png b.png"},
+            ],
+        )
+
+        logs = reader.search(query)
+
+        assert [log["command"] for log in logs] == ["magick résumé.png -crop 10x10 out.png"]
+        assert logs[0]["log_type"] == "execution"
+
+
+@pytest.mark.parametrize(
+    "start,end,expected",
+    [
+        (None, None, [0, 1, 2]),
+        ("2024-01-01T10:00:01", None, [1, 2]),
+        (None, "2024-01-01T10:00:01", [0, 1]),
+        ("2024-01-01T10:00:01", "2024-01-01T10:00:01", [1]),
+    ],
+)
+def test_entry_predicate(start, end, expected):
+    """Test predicates for each filter shape, reused for repeated queries."""
+    logs = [
+        {"timestamp": f"2024-01-01T10:00:0{i}", "provider": "openai", "i": i} for i in range(3)
+    ]
+    predicate = _entry_predicate((("provider", "openai"),), start, end)
+
+    assert [log["i"] for log in filter(predicate, logs)] == expected
+    assert _entry_predicate((("provider", "openai"),), start, end) is predicate
+    assert not any(map(_entry_predicate((("provider", "google"),), start, end), logs))
+
+
+@pytest.mark.parametrize(
+    "timestamp,expected",
+    [
+        ("2024-01-01T10:20:30.123456Z", "10:20:30"),
+        ("2024-01-01T10:20:30", "10:20:30"),
+        ("2024-01-01 10:20:30+00:00", "10:20:30"),
+        ("not a timestamp", "not a timestamp"),
+        ("", ""),
+    ],
+)
+def test_fast_time(timestamp, expected):
+    """Test time-of-day extraction from log timestamps."""
+    assert _fast_time(timestamp) == expected
+
+
+def test_unified_table_separates_sessions(reader):
+    """Test that a divider row goes between runs of different sessions only."""
+    logs = [
+        {"log_type": "llm", "event": "llm_request", "session_id": "aaaaaaaaaa"},
+        {"log_type": "llm", "event": "llm_request", "session_id": "aaaaaaaaaa"},
+        {"log_type": "llm", "event": "unknown", "session_id": "cccccccccc"},
+        {"log_type": "execution", "event": "user_feedback", "session_id": "bbbbbbbbbb"},
+    ]
+
+    table_data, headers = reader.format_unified_logs_for_display(logs)
+
+    assert [row[0] for row in table_data] == ["aaaaaaaa", "aaaaaaaa", "════════", "bbbbbbbb"]
+    assert all(len(row) == len(headers) for row in table_data)
+
+
+def test_table_cells_only_marked_when_truncated(reader):
+    """Test that short commands are shown as is and long ones are cut with "..."."""
+    logs = [
+        {"event": "command_validation", "command": "magick a.jpg b.png"},
+        {"event": "command_validation", "command": "magick " + "x" * 100},
+    ]
+
+    table_data, _ = reader.format_executions_for_display(logs)
+
+    assert table_data[0][2] == "magick a.jpg b.png"
+    assert table_data[1][2] == ("magick " + "x" * 100)[:50] + "..."
@@ -0,0 +1,145 @@
+"""Tests for logging configuration."""
+
+import atexit
+import gzip
+import json
+import logging
+import queue
+
+import pytest
+
+from imagemagick_agent import logging_config
+from imagemagick_agent.log_reader import LogReader
+from imagemagick_agent.logging_config import (
+    _attach_queued,
+    _BatchingQueueListener,
+    _BatchingRotatingFileHandler,
+    _compress_backups,
+    _listeners,
+    log_json,
+)
+
+
+def test_rotated_files_are_gzipped(tmp_path):
+    """Test that compressed backups are shifted and the live file stays plain text."""
+    path = tmp_path / "llm_calls.jsonl"
+    handler = _BatchingRotatingFileHandler(path, maxBytes=20, backupCount=2)
+    _compress_backups(handler)
+
+    for i in range(3):
+        handler.emit(logging.makeLogRecord({"msg": f'{{"i": {i}, "pad": "xxxxxx"}}'}))
+        handler.flush()
+    handler.close()
+
+    assert path.read_text() == '{"i": 2, "pad": "xxxxxx"}\n'
+    assert gzip.decompress((tmp_path / "llm_calls.jsonl.1.gz").read_bytes()).startswith(b'{"i": 1')
+    assert gzip.decompress((tmp_path / "llm_calls.jsonl.2.gz").read_bytes()).startswith(b'{"i": 0')
+
+
+def make_record(i):
+    """Create a log record whose line is 20 characters long."""
+    return logging.makeLogRecord({"msg": f'{{"i": {i}, "p": "xx"}}'})
+
+
+def test_queued_burst_written_when_queue_drains(tmp_path):
+    """Test that records are buffered until the queue runs empty, then written together."""
+    path = tmp_path / "batch.jsonl"
+    handler = _BatchingRotatingFileHandler(path)
+    records = queue.Queue()
+    listener = _BatchingQueueListener(records, handler)
+    for i in range(3):
+        records.put(make_record(i))
+
+    for _ in range(2):
+        listener.handle(records.get())
+        assert path.read_text() == ""
+    listener.handle(records.get())
+    handler.close()
+
+    assert path.read_text().splitlines() == [f'{{"i": {i}, "p": "xx"}}' for i in range(3)]
+
+
+def test_batch_rotates_at_max_bytes(tmp_path):
+    """Test that a batch crossing maxBytes is split across the rotated and live files."""
+    path = tmp_path / "batch.jsonl"
+    handler = _BatchingRotatingFileHandler(path, maxBytes=50, backupCount=2)
+
+    for i in range(4):
+        handler.emit(make_record(i))
+    handler.flush()
+    handler.close()
+
+    assert (tmp_path / "batch.jsonl.1").read_text().splitlines() == [
+        f'{{"i": {i}, "p": "xx"}}' for i in (0, 1)
+    ]
+    assert path.read_text().splitlines() == [f'{{"i": {i}, "p": "xx"}}' for i in (2, 3)]
+
+
+def test_queued_records_reach_file_on_stop(tmp_path):
+    """Test that records still queued when the listener stops (as at exit) are written."""
+    logger = logging.getLogger(f"test_queued.{tmp_path.name}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = _BatchingRotatingFileHandler(tmp_path / "queued.jsonl")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _attach_queued(logger, handler)
+    # Stop the listener here rather than at exit
+    listener = _listeners.pop()
+    atexit.unregister(listener.stop)
+
+    try:
+        for i in range(200):
+            logger.debug('{"i": %d}', i)
+    finally:
+        listener.stop()
+        logger.handlers.clear()
+        handler.close()
+
+    assert (tmp_path / "queued.jsonl").read_text().splitlines() == [
+        f'{{"i": {i}}}' for i in range(200)
+    ]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def serializer(request, monkeypatch):
+    """Serialize log entries with orjson (compact) or the stdlib fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(
+            logging_config, "_dumps", lambda data: json.dumps(data, ensure_ascii=False)
+        )
+    return request.param
+
+
+def test_log_json_round_trips_through_reader(tmp_path, serializer):
+    """Test that entries written by either serializer are found by the log reader."""
+    logger = logging.getLogger(f"test_log_json.{serializer}.{tmp_path.name}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = logging.FileHandler(tmp_path / "llm_calls.jsonl", encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    try:
+        for i, success in enumerate([True, False]):
+            log_json(
+                logger,
+                {
+                    "event": "llm_response",
+                    "provider": "openai",
+                    "generated_command": f"magick фото{i}.jpg out.png",
+                    "success": success,
+                },
+            )
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    raw = (tmp_path / "llm_calls.jsonl").read_text(encoding="utf-8")
+    assert ('"success":true' in raw) == (serializer == "orjson")
+
+    reader = LogReader(tmp_path)
+    calls = reader.get_llm_calls(provider="openai", success=True)
+    assert [call["generated_command"] for call in calls] == ["magick фото0.jpg out.png"]
+    assert len(reader.search("ФОТО1")) == 1
+    assert reader.get_counts_fast()["llm_calls"] == {"total": 2, "successful": 1, "failed": 1}
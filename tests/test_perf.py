@@ -0,0 +1,42 @@
+"""Micro-benchmarks for the command executor (run with ``pytest -m perf``)."""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from imagemagick_agent.executor import CommandExecutor, _tokenize  # noqa: E402
+
+pytestmark = pytest.mark.perf
+
+COMMAND = "magick input.jpg -resize 800x600 -quality 90 outputs/output.jpg"
+
+
+def test_validate_command(benchmark, executor):
+    """Benchmark validating a repeated command."""
+    assert benchmark(executor.validate_command, COMMAND) == (True, None)
+
+
+def test_validate_command_uncached(benchmark):
+    """Benchmark the validation checks themselves, bypassing the caches."""
+    check = CommandExecutor._check_command.__wrapped__
+
+    def run():
+        _tokenize.cache_clear()
+        return check(CommandExecutor, COMMAND)
+
+    assert benchmark(run) == (None, None)
+
+
+def test_sanitize_output_path(benchmark, executor):
+    """Benchmark stripping the output directory."""
+    benchmark(executor.sanitize_output_path, COMMAND)
+
+
+def test_extract_output_file(benchmark, executor):
+    """Benchmark finding the output file."""
+    benchmark(executor.extract_output_file, COMMAND)
+
+
+def test_executor_construction(benchmark):
+    """Benchmark creating an executor, including ImageMagick detection."""
+    benchmark(CommandExecutor)
@@ -0,0 +1,119 @@
+"""Tests for the semantic command cache."""
+
+import pytest
+from unittest.mock import Mock
+
+np = pytest.importorskip("numpy")
+
+from imagemagick_agent.llm import SemanticCacheClient
+from imagemagick_agent.semantic_cache import SemanticCache
+
+
+def fake_encoder(text):
+    """Embed text as a bag of hashed words so paraphrases share most dimensions."""
+    vector = np.zeros(64, dtype=np.float32)
+    for word in text.lower().split():
+        vector[hash(word) % 64] += 1.0
+    return vector
+
+
+@pytest.fixture
+def cache():
+    """Create an in-memory semantic cache."""
+    return SemanticCache(threshold=0.8, encoder=fake_encoder)
+
+
+class TestSemanticCache:
+    """Test semantic cache lookups."""
+
+    def test_empty_cache_misses(self, cache):
+        """Test that an empty cache never hits."""
+        assert cache.get("resize input.jpg to 800x600") is None
+
+    def test_similar_request_hits(self, cache):
+        """Test that a near-identical request reuses the stored command."""
+        cache.put("please resize input.jpg to 800x600", "magick input.jpg -resize 800x600 out.jpg")
+
+        assert cache.get("resize input.jpg to 800x600") == "magick input.jpg -resize 800x600 out.jpg"
+
+    def test_dissimilar_request_misses(self, cache):
+        """Test that unrelated requests are not served from the cache."""
+        cache.put("resize input.jpg to 800x600", "magick input.jpg -resize 800x600 out.jpg")
+
+        assert cache.get("blur input.jpg with a strong gaussian blur") is None
+
+    def test_different_files_miss(self, cache):
+        """Test that a request about other files never reuses a command."""
+        cache.put("resize input.jpg to 800x600", "magick input.jpg -resize 800x600 out.jpg")
+
+        assert cache.get("resize other.jpg to 800x600") is None
+
+    @pytest.mark.parametrize(
+        "stored,request_",
+        [
+            ("resize input.jpg to 800x600", "resize input.jpg to 400x300"),
+            ("rotate input.jpg by 90 degrees", "rotate input.jpg by 45 degrees"),
+            ("resize input.jpg to 50%", "resize input.jpg to 50"),
+        ],
+    )
+    def test_different_numbers_miss(self, cache, stored, request_):
+        """Test that a request with other sizes or angles never reuses a command."""
+        cache.put(stored, "magick input.jpg -resize 800x600 out.jpg")
+
+        assert cache.get(request_) is None
+
+    def test_non_command_reply_not_stored(self, cache):
+        """Test that clarifying questions from the LLM are not cached."""
+        cache.put("resize input.jpg", "What size should input.jpg be resized to?")
+
+        assert len(cache) == 0
+
+    def test_scopes_are_separate(self, tmp_path):
+        """Test that entries are not shared across ImageMagick binaries."""
+        db_path = tmp_path / "cache.db"
+        magick = SemanticCache(path=db_path, encoder=fake_encoder, scope="openai/magick")
+        magick.put("rotate input.jpg by 90", "magick input.jpg -rotate 90 out.jpg")
+        magick.close()
+
+        convert = SemanticCache(path=db_path, encoder=fake_encoder, scope="openai/convert")
+        assert len(convert) == 0
+        assert convert.get("rotate input.jpg by 90") is None
+
+    def test_persistence(self, tmp_path):
+        """Test that entries survive across cache instances."""
+        db_path = tmp_path / "cache.db"
+        first = SemanticCache(path=db_path, encoder=fake_encoder)
+        first.put("rotate input.jpg by 90", "magick input.jpg -rotate 90 out.jpg")
+        first.close()
+
+        second = SemanticCache(path=db_path, encoder=fake_encoder)
+        assert len(second) == 1
+        assert second.get("rotate input.jpg by 90") == "magick input.jpg -rotate 90 out.jpg"
+
+
+class TestSemanticCacheClient:
+    """Test the caching LLM client wrapper."""
+
+    def test_miss_then_hit(self, cache):
+        """Test that the wrapped client is only called on a cache miss."""
+        inner = Mock()
+        inner.generate_command = Mock(return_value="magick input.jpg output.png")
+        client = SemanticCacheClient(inner, cache)
+
+        client.generate_command("convert input.jpg to png", [])
+        client.generate_command("convert input.jpg to png", [])
+
+        inner.generate_command.assert_called_once()
+
+    def test_history_bypasses_cache(self, cache):
+        """Test that follow-up requests always reach the LLM."""
+        inner = Mock()
+        inner.generate_command = Mock(return_value="magick input.jpg -rotate 90 output.jpg")
+        client = SemanticCacheClient(inner, cache)
+        history = [{"role": "user", "content": "resize input.jpg"}]
+
+        client.generate_command("now rotate it", history)
+        client.generate_command("now rotate it", history)
+
+        assert inner.generate_command.call_count == 2
+        assert len(cache) == 0
@@ -0,0 +1,206 @@
+"""Tests for the web log viewer."""
+
+import json
+import queue
+import time
+
+import pytest
+
+from imagemagick_agent.log_reader import LogReader
+from imagemagick_agent.web_logs import LogTailer, StatsRefresher, _sse_batch, create_app
+
+
+def write_jsonl(path, entries):
+    """Write log entries as JSON lines."""
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+class TestLogTailer:
+    """Test following log files for live streaming."""
+
+    @pytest.fixture
+    def tailer(self, tmp_path):
+        """Create a tailer over an LLM and an execution log."""
+        tailer = LogTailer(
+            {"llm": tmp_path / "llm_calls.jsonl", "execution": tmp_path / "executions.jsonl"},
+            poll_interval=0.01,
+        )
+        yield tailer
+        tailer.close()
+
+    def test_new_entries_reach_every_subscriber(self, tailer):
+        """Test that appended entries are tagged and fanned out, old ones skipped."""
+        write_jsonl(tailer.files["llm"], [{"event": "llm_request", "i": 0}])
+        first, second = tailer.subscribe(), tailer.subscribe()
+
+        write_jsonl(tailer.files["execution"], [{"event": "command_execution", "i": 1}])
+
+        for subscriber in (first, second):
+            entry = subscriber.get(timeout=5)
+            assert (entry["log_type"], entry["i"]) == ("execution", 1)
+            assert subscriber.empty()
+
+    def test_rotated_file_is_read_from_start(self, tailer):
+        """Test that a replaced file is followed from its first line."""
+        path = tailer.files["llm"]
+        write_jsonl(path, [{"i": 0}] * 10)
+        subscriber = tailer.subscribe()
+
+        path.rename(path.with_suffix(".jsonl.1"))
+        write_jsonl(path, [{"i": 1}])
+
+        assert subscriber.get(timeout=5)["i"] == 1
+
+    def test_partial_line_waits_for_newline(self, tailer):
+        """Test that a line is delivered once, after it is complete."""
+        path = tailer.files["llm"]
+        path.touch()
+        subscriber = tailer.subscribe()
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"i": ')
+            f.flush()
+            time.sleep(0.05)
+            f.write("0}\n")
+        write_jsonl(path, [{"i": 1}])
+
+        assert [subscriber.get(timeout=5)["i"] for _ in range(2)] == [0, 1]
+
+    def test_unsubscribed_queue_gets_nothing(self, tailer):
+        """Test that entries stop after unsubscribing."""
+        subscriber = tailer.subscribe()
+        other = tailer.subscribe()
+        tailer.unsubscribe(subscriber)
+
+        write_jsonl(tailer.files["llm"], [{"i": 0}])
+
+        assert other.get(timeout=5)["i"] == 0
+        assert subscriber.empty()
+
+
+def test_sse_batch_drains_queued_entries():
+    """Test that queued entries are sent as one chunk of SSE frames."""
+    subscriber = queue.SimpleQueue()
+    for i in (1, 2):
+        subscriber.put({"i": i})
+
+    chunk = _sse_batch({"i": 0}, subscriber)
+
+    frames = chunk.split(b"\n\n")
+    assert frames.pop() == b""
+    assert [json.loads(frame[len(b"data: ") :]) for frame in frames] == [{"i": i} for i in range(3)]
+    assert subscriber.empty()
+
+
+def test_stats_refresher_folds_in_new_entries(tmp_path):
+    """Test that appended entries are parsed in the background."""
+    reader = LogReader(tmp_path)
+    refresher = StatsRefresher(reader, interval=0.01)
+    try:
+        write_jsonl(reader.exec_log_file, [{"event": "command_execution", "success": True}])
+        deadline = time.monotonic() + 5
+        while reader.exec_log_file not in reader._cache and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert reader._cache[reader.exec_log_file].entries == [
+            {"event": "command_execution", "success": True}
+        ]
+    finally:
+        refresher.close()
+
+
+class TestLogEndpoints:
+    """Test the log query endpoints."""
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        """Create a test client over a small log history."""
+        write_jsonl(
+            tmp_path / "llm_calls.jsonl",
+            [
+                {
+                    "event": "llm_response",
+                    "timestamp": f"2024-01-01T10:00:0{i}",
+                    "provider": "openai" if i % 2 else "google",
+                    "success": i != 3,
+                    "generated_command": f"magick in{i}.jpg out.jpg",
+                }
+                for i in range(6)
+            ],
+        )
+        return create_app(tmp_path, refresh_interval=None).test_client()
+
+    def test_llm_calls_newest_first(self, client):
+        """Test that the limit keeps the most recent matching entries."""
+        logs = client.get("/api/llm-calls?provider=openai&limit=2").get_json()
+
+        assert [log["timestamp"][-1] for log in logs] == ["5", "3"]
+
+    def test_llm_calls_filters(self, client):
+        """Test the success and time range filters."""
+        logs = client.get(
+            "/api/llm-calls?success=true&start=2024-01-01T10:00:02&end=2024-01-01T10:00:04"
+        ).get_json()
+
+        assert [log["timestamp"][-1] for log in logs] == ["4", "2"]
+
+    def test_search(self, client):
+        """Test case-insensitive search, tagged with the log type."""
+        logs = client.get("/api/search?q=IN1.JPG").get_json()
+
+        assert [(log["generated_command"], log["log_type"]) for log in logs] == [
+            ("magick in1.jpg out.jpg", "llm")
+        ]
+
+    def test_stats(self, client):
+        """Test the summary statistics."""
+        stats = client.get("/api/stats").get_json()
+
+        assert stats["llm_calls"]["total"] == 6
+        assert stats["llm_calls"]["failed"] == 1
+        assert stats["executions"]["total"] == 0
+
+    def test_unchanged_logs_answer_not_modified(self, client, tmp_path):
+        """Test that a matching ETag gets 304 until the logs change."""
+        etag = client.get("/api/stats").headers["ETag"]
+
+        assert client.get("/api/stats", headers={"If-None-Match": etag}).status_code == 304
+
+        write_jsonl(tmp_path / "executions.jsonl", [{"event": "command_execution"}])
+        response = client.get("/api/stats", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.get_json()["executions"]["total"] == 1
+
+    def test_repeated_query_is_served_from_cache(self, client, tmp_path, monkeypatch):
+        """Test that a repeated query skips the reader until the logs change."""
+        calls = []
+        original = LogReader.get_llm_calls
+
+        def counting(self, *args, **kwargs):
+            calls.append(kwargs)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(LogReader, "get_llm_calls", counting)
+        first = client.get("/api/llm-calls?provider=openai").get_json()
+
+        assert client.get("/api/llm-calls?provider=openai").get_json() == first
+        assert len(calls) == 1
+
+        write_jsonl(tmp_path / "llm_calls.jsonl", [{"event": "llm_request", "provider": "openai"}])
+
+        assert len(client.get("/api/llm-calls?provider=openai").get_json()) == len(first) + 1
+        assert len(calls) == 2
+
+    def test_stream_headers(self, client, monkeypatch):
+        """Test that the event stream isn't cached or buffered by proxies."""
+        monkeypatch.setattr("imagemagick_agent.web_logs.KEEPALIVE_INTERVAL", 0.01)
+        response = client.get("/api/stream", buffered=False)
+        try:
+            assert response.mimetype == "text/event-stream"
+            assert response.headers["Cache-Control"] == "no-cache"
+            assert response.headers["X-Accel-Buffering"] == "no"
+        finally:
+            response.close()